@@ -1,11 +1,13 @@
 from stompman.client import Client
-from stompman.config import ConnectionParameters, Heartbeat
+from stompman.config import ConnectionParameters, Heartbeat, SocketOptions
 from stompman.errors import (
+    ClientClosedError,
     ConnectionConfirmationTimeout,
     ConnectionLostError,
     Error,
     FailedAllConnectAttemptsError,
     FailedAllWriteAttemptsError,
+    FrameLimitExceededError,
     StompProtocolConnectionIssue,
     UnsupportedProtocolVersion,
 )
@@ -25,14 +27,24 @@ from stompman.frames import (
     HeartbeatFrame,
     MessageFrame,
     NackFrame,
+    RawMessageFrame,
     ReceiptFrame,
     SendFrame,
     SubscribeFrame,
     UnsubscribeFrame,
 )
 from stompman.logger import LOGGER as logger  # noqa: N811
+from stompman.outbox import Outbox
+from stompman.retry import ExponentialBackoff, RetryPolicy
+from stompman.sender import PreparedSender
 from stompman.serde import FrameParser, dump_frame
-from stompman.subscription import AckableMessageFrame, AutoAckSubscription, ManualAckSubscription
+from stompman.server_health import ServerHealth, ServerHealthTracker
+from stompman.subscription import (
+    AckableMessageFrame,
+    AckableRawMessageFrame,
+    AutoAckSubscription,
+    ManualAckSubscription,
+)
 from stompman.transaction import Transaction
 
 __all__ = [
@@ -40,12 +52,14 @@ __all__ = [
     "AckFrame",
     "AckMode",
     "AckableMessageFrame",
+    "AckableRawMessageFrame",
     "AnyClientFrame",
     "AnyRealServerFrame",
     "AnyServerFrame",
     "AutoAckSubscription",
     "BeginFrame",
     "Client",
+    "ClientClosedError",
     "CommitFrame",
     "ConnectFrame",
     "ConnectedFrame",
@@ -55,16 +69,25 @@ __all__ = [
     "DisconnectFrame",
     "Error",
     "ErrorFrame",
+    "ExponentialBackoff",
     "FailedAllConnectAttemptsError",
     "FailedAllWriteAttemptsError",
+    "FrameLimitExceededError",
     "FrameParser",
     "Heartbeat",
     "HeartbeatFrame",
     "ManualAckSubscription",
     "MessageFrame",
     "NackFrame",
+    "Outbox",
+    "PreparedSender",
+    "RawMessageFrame",
     "ReceiptFrame",
+    "RetryPolicy",
     "SendFrame",
+    "ServerHealth",
+    "ServerHealthTracker",
+    "SocketOptions",
     "StompProtocolConnectionIssue",
     "SubscribeFrame",
     "Transaction",
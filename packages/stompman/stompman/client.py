@@ -7,7 +7,7 @@ from datetime import timedelta
 from functools import partial
 from ssl import SSLContext
 from types import TracebackType
-from typing import Any, ClassVar, Literal, Self
+from typing import Any, ClassVar, Literal, Self, overload
 
 from stompman.config import ConnectionParameters, Heartbeat
 from stompman.connection import AbstractConnection, Connection
@@ -15,15 +15,28 @@ from stompman.connection_lifespan import ConnectionLifespan
 from stompman.connection_manager import ConnectionManager
 from stompman.frames import (
     AckMode,
+    BytesLike,
     ConnectedFrame,
     ErrorFrame,
     HeartbeatFrame,
     MessageFrame,
+    RawMessageFrame,
     ReceiptFrame,
     SendFrame,
 )
 from stompman.logger import LOGGER
-from stompman.subscription import AckableMessageFrame, ActiveSubscriptions, AutoAckSubscription, ManualAckSubscription
+from stompman.outbox import Outbox
+from stompman.retry import RetryPolicy
+from stompman.sender import PreparedSender
+from stompman.serde import FrameParser
+from stompman.server_health import ServerHealthTracker
+from stompman.subscription import (
+    AckableMessageFrame,
+    AckableRawMessageFrame,
+    ActiveSubscriptions,
+    AutoAckSubscription,
+    ManualAckSubscription,
+)
 from stompman.transaction import Transaction
 
 
@@ -34,6 +47,34 @@ async def _run_handler_with_safety_net(coro: Coroutine[Any, Any, Any]) -> None:
         LOGGER.exception("unhandled exception in message handler")
 
 
+def _convert_message_frame(frame: MessageFrame | RawMessageFrame, *, raw: bool) -> MessageFrame | RawMessageFrame:
+    if raw and isinstance(frame, MessageFrame):
+        return RawMessageFrame.from_message_frame(frame)
+    if not raw and isinstance(frame, RawMessageFrame):
+        return frame.to_message_frame()
+    return frame
+
+
+def _make_ackable_message_frame(
+    frame: MessageFrame | RawMessageFrame, *, subscription: ManualAckSubscription, received_at_reconnection_count: int
+) -> AckableMessageFrame | AckableRawMessageFrame:
+    frame = _convert_message_frame(frame, raw=subscription.raw)
+    if isinstance(frame, RawMessageFrame):
+        return AckableRawMessageFrame(
+            command=frame.command,
+            headers=frame.headers,
+            body=frame.body,
+            _subscription=subscription,
+            _received_at_reconnection_count=received_at_reconnection_count,
+        )
+    return AckableMessageFrame(
+        headers=frame.headers,
+        body=frame.body,
+        _subscription=subscription,
+        _received_at_reconnection_count=received_at_reconnection_count,
+    )
+
+
 @dataclass(kw_only=True, slots=True)
 class Client:
     PROTOCOL_VERSION: ClassVar = "1.2"  # https://stomp.github.io/stomp-specification-1.2.html
@@ -48,6 +89,8 @@ class Client:
     connect_retry_attempts: int = 3
     connect_retry_interval: int = 1
     connect_timeout: int = 2
+    connect_stagger_delay: timedelta = timedelta(milliseconds=250)
+    """Try servers in order, starting next one if previous didn't connect within this delay."""
     read_max_chunk_size: int = 1024 * 1024
     write_retry_attempts: int = 3
     connection_confirmation_timeout: int = 2
@@ -60,6 +103,24 @@ class Client:
     """Keep background connection recovery alive after a retry cycle is exhausted."""
     max_concurrent_handlers: int | None = 100
     """Cap on concurrently-running message handlers. Set to None to disable the cap."""
+    raw_message_spool_threshold: int | None = None
+    """Spool bodies of raw subscription messages bigger than this many bytes to a temporary file. None to disable."""
+    max_frame_size: int | None = None
+    """Drop connection if incoming frame is bigger than this many bytes. None to disable."""
+    max_header_bytes: int | None = None
+    """Drop connection if command and header lines of incoming frame take more than this many bytes. None to disable."""
+    max_headers: int | None = None
+    """Drop connection if incoming frame has more headers than this. None to disable."""
+    write_coalescing_window: timedelta | None = None
+    """Send frames written within this window (zero for same event loop iteration) in one write. None to disable."""
+    max_queued_send_frames: int | None = None
+    """Queue at most this many SEND frames behind heartbeats and control frames in a writer task. None to disable."""
+    server_health: ServerHealthTracker = field(default_factory=ServerHealthTracker)
+    """Orders servers for reconnection by latency and recent failures. Call `.snapshot()` for monitoring."""
+    retry_policy: RetryPolicy | None = None
+    """Delays between connection attempts. None for `ExponentialBackoff` with jitter from `connect_retry_interval`."""
+    outbox: Outbox | None = None
+    """Accept SEND frames while reconnecting, up to outbox limits, instead of waiting to reconnect. None to disable."""
 
     connection_class: type[AbstractConnection] = Connection
 
@@ -87,12 +148,26 @@ class Client:
             connect_retry_attempts=self.connect_retry_attempts,
             connect_retry_interval=self.connect_retry_interval,
             connect_timeout=self.connect_timeout,
+            connect_stagger_delay=self.connect_stagger_delay,
             read_max_chunk_size=self.read_max_chunk_size,
             write_retry_attempts=self.write_retry_attempts,
             check_server_alive_interval_factor=self.check_server_alive_interval_factor,
             no_message_restart_interval=self.no_message_restart_interval,
             keep_alive_on_connection_failure=self.keep_alive_on_connection_failure,
             ssl=self.ssl,
+            frame_parser_factory=partial(
+                FrameParser,
+                raw_message_subscription_ids=self._active_subscriptions.raw_subscription_ids,
+                raw_message_spool_threshold=self.raw_message_spool_threshold,
+                max_frame_size=self.max_frame_size,
+                max_header_bytes=self.max_header_bytes,
+                max_headers=self.max_headers,
+            ),
+            write_coalescing_window=self.write_coalescing_window,
+            max_queued_send_frames=self.max_queued_send_frames,
+            server_health=self.server_health,
+            retry_policy=self.retry_policy,
+            outbox=self.outbox,
         )
         if self.max_concurrent_handlers is not None:
             self._handler_semaphore = asyncio.Semaphore(self.max_concurrent_handlers)
@@ -118,7 +193,7 @@ class Client:
         async with asyncio.TaskGroup() as task_group:
             async for frame, epoch in self._connection_manager.read_frames_reconnecting():
                 match frame:
-                    case MessageFrame():
+                    case MessageFrame() | RawMessageFrame():
                         self._connection_manager._last_message_received_time = time.time()
                         received_at_reconnection_count = epoch
                         if subscription := self._active_subscriptions.get_by_id(frame.headers["subscription"]):
@@ -126,16 +201,15 @@ class Client:
                                 await self._handler_semaphore.acquire()
                             handler_coro = (
                                 subscription._run_handler(
-                                    frame=frame,
+                                    frame=_convert_message_frame(frame, raw=subscription.raw),
                                     received_at_reconnection_count=received_at_reconnection_count,
                                 )
                                 if isinstance(subscription, AutoAckSubscription)
                                 else subscription.handler(
-                                    AckableMessageFrame(
-                                        headers=frame.headers,
-                                        body=frame.body,
-                                        _subscription=subscription,
-                                        _received_at_reconnection_count=received_at_reconnection_count,
+                                    _make_ackable_message_frame(
+                                        frame,
+                                        subscription=subscription,
+                                        received_at_reconnection_count=received_at_reconnection_count,
                                     )
                                 )
                             )
@@ -155,14 +229,15 @@ class Client:
 
     async def send(
         self,
-        body: bytes,
+        body: BytesLike,
         destination: str,
         *,
         content_type: str | None = None,
         add_content_length: bool = True,
         headers: dict[str, str] | None = None,
-    ) -> None:
-        await self._connection_manager.write_frame_reconnecting(
+    ) -> asyncio.Future[None]:
+        """Write SEND frame, or put it to `outbox` while reconnecting. Returned future is done when frame is written."""
+        return await self._connection_manager.send_frame(
             SendFrame.build(
                 body=body,
                 destination=destination,
@@ -173,6 +248,22 @@ class Client:
             )
         )
 
+    def prepare_sender(
+        self,
+        destination: str,
+        *,
+        content_type: str | None = None,
+        add_content_length: bool = True,
+        headers: dict[str, str] | None = None,
+    ) -> PreparedSender:
+        return PreparedSender(
+            destination=destination,
+            content_type=content_type,
+            add_content_length=add_content_length,
+            headers=headers,
+            _connection_manager=self._connection_manager,
+        )
+
     @asynccontextmanager
     async def begin(self) -> AsyncGenerator[Transaction, None]:
         async with Transaction(
@@ -180,6 +271,7 @@ class Client:
         ) as transaction:
             yield transaction
 
+    @overload
     async def subscribe(
         self,
         destination: str,
@@ -189,12 +281,37 @@ class Client:
         headers: dict[str, str] | None = None,
         on_suppressed_exception: Callable[[Exception, MessageFrame], Any],
         suppressed_exception_classes: tuple[type[Exception], ...] = (Exception,),
+        raw: Literal[False] = False,
+    ) -> "AutoAckSubscription": ...
+    @overload
+    async def subscribe(
+        self,
+        destination: str,
+        handler: Callable[[RawMessageFrame], Awaitable[Any]],
+        *,
+        ack: AckMode = "client-individual",
+        headers: dict[str, str] | None = None,
+        on_suppressed_exception: Callable[[Exception, RawMessageFrame], Any],
+        suppressed_exception_classes: tuple[type[Exception], ...] = (Exception,),
+        raw: Literal[True],
+    ) -> "AutoAckSubscription": ...
+    async def subscribe(
+        self,
+        destination: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        *,
+        ack: AckMode = "client-individual",
+        headers: dict[str, str] | None = None,
+        on_suppressed_exception: Callable[[Exception, Any], Any],
+        suppressed_exception_classes: tuple[type[Exception], ...] = (Exception,),
+        raw: bool = False,
     ) -> "AutoAckSubscription":
         subscription = AutoAckSubscription(
             destination=destination,
             handler=handler,
             headers=headers,
             ack=ack,
+            raw=raw,
             on_suppressed_exception=on_suppressed_exception,
             suppressed_exception_classes=suppressed_exception_classes,
             _connection_manager=self._connection_manager,
@@ -203,6 +320,7 @@ class Client:
         await subscription._subscribe()
         return subscription
 
+    @overload
     async def subscribe_with_manual_ack(
         self,
         destination: str,
@@ -210,12 +328,33 @@ class Client:
         *,
         ack: AckMode = "client-individual",
         headers: dict[str, str] | None = None,
+        raw: Literal[False] = False,
+    ) -> "ManualAckSubscription": ...
+    @overload
+    async def subscribe_with_manual_ack(
+        self,
+        destination: str,
+        handler: Callable[[AckableRawMessageFrame], Coroutine[Any, Any, Any]],
+        *,
+        ack: AckMode = "client-individual",
+        headers: dict[str, str] | None = None,
+        raw: Literal[True],
+    ) -> "ManualAckSubscription": ...
+    async def subscribe_with_manual_ack(
+        self,
+        destination: str,
+        handler: Callable[[Any], Coroutine[Any, Any, Any]],
+        *,
+        ack: AckMode = "client-individual",
+        headers: dict[str, str] | None = None,
+        raw: bool = False,
     ) -> "ManualAckSubscription":
         subscription = ManualAckSubscription(
             destination=destination,
             handler=handler,
             headers=headers,
             ack=ack,
+            raw=raw,
             _connection_manager=self._connection_manager,
             _active_subscriptions=self._active_subscriptions,
         )
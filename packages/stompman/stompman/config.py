@@ -1,3 +1,4 @@
+import socket
 from dataclasses import dataclass, field
 from typing import Self, TypedDict
 from urllib.parse import unquote
@@ -17,6 +18,48 @@ class Heartbeat:
         return cls(int(first), int(second))
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SocketOptions:
+    """TCP socket options that are applied to each connection right after it's established.
+
+    Defaults favour latency: Nagle's algorithm is disabled and dead links are detected by TCP keepalive in about a
+    minute even if heartbeats are disabled. None leaves OS default.
+    """
+
+    tcp_nodelay: bool = True
+    receive_buffer_size: int | None = None
+    """SO_RCVBUF in bytes, e.g. 4 MiB for bulk transfer between datacenters."""
+    send_buffer_size: int | None = None
+    """SO_SNDBUF in bytes."""
+    keepalive: bool = True
+    keepalive_idle: int | None = 30
+    """Seconds of inactivity before first keepalive probe."""
+    keepalive_interval: int | None = 10
+    """Seconds between keepalive probes."""
+    keepalive_probes: int | None = 3
+    """Number of unanswered probes after which connection is dropped."""
+
+    def apply(self, sock: socket.socket) -> None:
+        if sock.family not in {socket.AF_INET, socket.AF_INET6}:
+            return
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.tcp_nodelay))
+        if self.receive_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size)
+        if self.send_buffer_size is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(self.keepalive))
+        if not self.keepalive:
+            return
+        # TCP_KEEPIDLE is called TCP_KEEPALIVE on macOS
+        for option_name, value in (
+            ("TCP_KEEPIDLE" if hasattr(socket, "TCP_KEEPIDLE") else "TCP_KEEPALIVE", self.keepalive_idle),
+            ("TCP_KEEPINTVL", self.keepalive_interval),
+            ("TCP_KEEPCNT", self.keepalive_probes),
+        ):
+            if value is not None and (option := getattr(socket, option_name, None)) is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, option, value)
+
+
 class MultiHostHostLike(TypedDict):
     username: str | None
     password: str | None
@@ -32,6 +75,7 @@ class ConnectionParameters:
     passcode: str = field(repr=False)
     ws_uri_path: str | None = None
     connect_headers: dict[str, str] = field(default_factory=dict, repr=False)
+    socket_options: SocketOptions = field(default_factory=SocketOptions, repr=False)
 
     @property
     def unescaped_passcode(self) -> str:
@@ -1,20 +1,26 @@
 import asyncio
 import socket
 import time
-from collections.abc import AsyncGenerator, Generator, Iterator
+from collections.abc import AsyncGenerator, Callable, Generator, Iterator
 from contextlib import contextmanager, suppress
 from dataclasses import dataclass, field
+from datetime import timedelta
 from ssl import SSLContext
-from typing import Literal, Protocol, Self, cast
+from typing import Final, Literal, Protocol, Self, cast
 
-from stompman.errors import ConnectionLostError
-from stompman.frames import AnyClientFrame, AnyServerFrame
-from stompman.serde import NEWLINE, FrameParser, dump_frame
+from stompman.config import SocketOptions
+from stompman.errors import ConnectionLostError, FrameLimitExceededError
+from stompman.frames import AnyClientFrame, AnyServerFrame, BytesLike
+from stompman.outbound import OutboundScheduler
+from stompman.serde import NEWLINE, FrameParser, dump_frame_parts
 
 
 @dataclass(kw_only=True)
 class AbstractConnection(Protocol):
     last_read_time: float | None = field(init=False, default=None)
+    frame_parser_factory: Callable[[], FrameParser] = field(init=False, default=FrameParser)
+    write_coalescing_window: timedelta | None = field(init=False, default=None)
+    max_queued_send_frames: int | None = field(init=False, default=None)
 
     @classmethod
     async def connect(
@@ -33,6 +39,23 @@ class AbstractConnection(Protocol):
     def read_frames(self) -> AsyncGenerator[AnyServerFrame, None]: ...
 
 
+async def write_frame_parts_or_frame(
+    connection: AbstractConnection, parts: list[BytesLike], build_frame: Callable[[], AnyClientFrame]
+) -> None:
+    """Write frame serialized in advance if connection has `write_frame_parts()`, otherwise build and write frame.
+
+    `async def write_frame_parts(self, parts: list[BytesLike]) -> None` is optional for connections: it writes buffers
+    as returned by `dump_frame_parts()` without building frame objects.
+    """
+    if (write_frame_parts := getattr(connection, "write_frame_parts", None)) is None:
+        await connection.write_frame(build_frame())
+    else:
+        await write_frame_parts(parts)
+
+
+SEND_FRAME_PREFIX: Final = b"SEND\n"
+
+
 @contextmanager
 def reraise_connection_lost(*causes: type[Exception]) -> Generator[None, None, None]:
     try:
@@ -41,12 +64,26 @@ def reraise_connection_lost(*causes: type[Exception]) -> Generator[None, None, N
         raise ConnectionLostError(reason=exception) from exception
 
 
+def parse_frames_reraising_connection_lost(parser: FrameParser, chunk: bytes) -> Iterator[AnyServerFrame]:
+    # Frames are yielded one by one, so frames parsed before the one that exceeds limits are not lost
+    frames = cast("Iterator[AnyServerFrame]", parser.parse_frames_from_chunk(chunk))
+    while True:
+        with reraise_connection_lost(FrameLimitExceededError):
+            frame = next(frames, None)
+        if frame is None:
+            return
+        yield frame
+
+
 @dataclass(kw_only=True, slots=True)
 class Connection(AbstractConnection):
     reader: asyncio.StreamReader
     writer: asyncio.StreamWriter
     read_max_chunk_size: int
     ssl: Literal[True] | SSLContext | None
+    _pending_parts: list[BytesLike] = field(init=False, default_factory=list)
+    _flush_task: asyncio.Task[None] | None = field(init=False, default=None)
+    _outbound_scheduler: OutboundScheduler | None = field(init=False, default=None)
 
     @classmethod
     async def connect(
@@ -74,18 +111,70 @@ class Connection(AbstractConnection):
                 ssl=ssl,
             )
 
+    def apply_socket_options(self, options: SocketOptions) -> None:
+        if (sock := self.writer.get_extra_info("socket")) is not None:
+            options.apply(sock)
+
     async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+        if self._outbound_scheduler is not None:
+            self._outbound_scheduler.close()
         self.writer.close()
         with suppress(ConnectionError):
             await self.writer.wait_closed()
 
     def write_heartbeat(self) -> None:
+        if outbound_scheduler := self._get_outbound_scheduler():
+            return outbound_scheduler.write_heartbeat()
         with reraise_connection_lost(RuntimeError):
             return self.writer.write(NEWLINE)
 
+    def _get_outbound_scheduler(self) -> OutboundScheduler | None:
+        if self._outbound_scheduler is None and self.max_queued_send_frames is not None:
+            self._outbound_scheduler = OutboundScheduler(
+                write=self._write_and_drain, max_queued_send_frames=self.max_queued_send_frames
+            )
+        return self._outbound_scheduler
+
     async def write_frame(self, frame: AnyClientFrame) -> None:
+        await self.write_frame_parts(dump_frame_parts(frame))
+
+    async def write_frame_parts(self, parts: list[BytesLike]) -> None:
+        if outbound_scheduler := self._get_outbound_scheduler():
+            if parts[0][: len(SEND_FRAME_PREFIX)] == SEND_FRAME_PREFIX:
+                await outbound_scheduler.write_send_frame(parts)
+            else:
+                await outbound_scheduler.write_control_frame(parts)
+            return
+        if self.write_coalescing_window is None:
+            await self._write_and_drain(parts)
+            return
+
+        # Frames written until flush task wakes up are sent with one write and one drain.
+        # Each writer waits for the whole batch and gets its error, if any.
+        self._pending_parts.extend(parts)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_pending_parts(self.write_coalescing_window))
+        flush_task = self._flush_task
+        try:
+            await asyncio.shield(flush_task)
+        except asyncio.CancelledError:
+            # Flush task is cancelled when connection is closed before batch is written
+            if not flush_task.cancelled():
+                raise
+            raise ConnectionLostError(reason="connection closed") from None
+
+    async def _flush_pending_parts(self, window: timedelta) -> None:
+        await asyncio.sleep(window.total_seconds())
+        parts, self._pending_parts, self._flush_task = self._pending_parts, [], None
+        await self._write_and_drain(parts)
+
+    async def _write_and_drain(self, parts: list[BytesLike]) -> None:
         with reraise_connection_lost(RuntimeError):
-            self.writer.write(dump_frame(frame))
+            self.writer.writelines(parts)
         with reraise_connection_lost(ConnectionError):
             await self.writer.drain()
 
@@ -95,12 +184,12 @@ class Connection(AbstractConnection):
         return chunk
 
     async def read_frames(self) -> AsyncGenerator[AnyServerFrame, None]:
-        parser = FrameParser()
+        parser = self.frame_parser_factory()
 
         while True:
             with reraise_connection_lost(ConnectionError):
                 raw_frames = await self._read_non_empty_bytes(self.read_max_chunk_size)
             self.last_read_time = time.time()
 
-            for frame in cast("Iterator[AnyServerFrame]", parser.parse_frames_from_chunk(raw_frames)):
+            for frame in parse_frames_reraising_connection_lost(parser, raw_frames):
                 yield frame
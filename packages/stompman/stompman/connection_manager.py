@@ -1,6 +1,6 @@
 import asyncio
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import timedelta
 from ssl import SSLContext
@@ -8,17 +8,22 @@ from types import TracebackType
 from typing import TYPE_CHECKING, Literal, Self
 
 from stompman.config import ConnectionParameters, Heartbeat
-from stompman.connection import AbstractConnection
+from stompman.connection import AbstractConnection, write_frame_parts_or_frame
 from stompman.errors import (
     AllServersUnavailable,
     AnyConnectionIssue,
+    ClientClosedError,
     ConnectionLostError,
     ConnectionLostOnLifespanEnter,
     FailedAllConnectAttemptsError,
     FailedAllWriteAttemptsError,
 )
-from stompman.frames import AckFrame, AnyClientFrame, AnyServerFrame, NackFrame
+from stompman.frames import AckFrame, AnyClientFrame, AnyServerFrame, BytesLike, ErrorFrame, NackFrame, SendFrame
 from stompman.logger import LOGGER
+from stompman.outbox import Outbox
+from stompman.retry import ExponentialBackoff, RetryPolicy
+from stompman.serde import FrameParser
+from stompman.server_health import ServerHealthTracker
 
 if TYPE_CHECKING:
     from stompman.connection_lifespan import AbstractConnectionLifespan, ConnectionLifespanFactory
@@ -48,6 +53,15 @@ def _log_dropped_frame(frame: AnyClientFrame, *, reason: str) -> None:
         LOGGER.info("dropping %s: %s", type(frame).__name__, reason)
 
 
+def _log_dropped_ack_frame(
+    frame_type: type[AckFrame | NackFrame], *, ack_id: str, subscription_id: str, reason: str
+) -> None:
+    if frame_type is NackFrame:
+        LOGGER.error("dropping NACK: %s. ack_id=%s, subscription_id=%s", reason, ack_id, subscription_id)
+    else:
+        LOGGER.warning("dropping ACK: %s. ack_id=%s, subscription_id=%s", reason, ack_id, subscription_id)
+
+
 @dataclass(kw_only=True, slots=True)
 class ConnectionManager:
     servers: list[ConnectionParameters]
@@ -62,16 +76,27 @@ class ConnectionManager:
     check_server_alive_interval_factor: int
     no_message_restart_interval: timedelta | None
     keep_alive_on_connection_failure: bool = False
+    frame_parser_factory: Callable[[], FrameParser] = FrameParser
+    write_coalescing_window: timedelta | None = None
+    max_queued_send_frames: int | None = None
+    connect_stagger_delay: timedelta = timedelta(milliseconds=250)
+    server_health: ServerHealthTracker = field(default_factory=ServerHealthTracker)
+    retry_policy: RetryPolicy | None = None
+    outbox: Outbox | None = None
 
     _active_connection_state: ActiveConnectionState | None = field(default=None, init=False)
     _reconnect_lock: asyncio.Lock = field(init=False, default_factory=asyncio.Lock)
     _task_group: asyncio.TaskGroup = field(init=False, default_factory=asyncio.TaskGroup)
     _send_heartbeat_task: asyncio.Task[None] = field(init=False, repr=False)
     _monitor_no_message_task: asyncio.Task[None] | None = field(default=None, init=False, repr=False)
+    _flush_outbox_task: asyncio.Task[None] | None = field(default=None, init=False, repr=False)
+    _written_future: asyncio.Future[None] = field(init=False, repr=False)
     _reconnection_count: int = field(default=0, init=False)
     _last_message_received_time: float = field(init=False, default_factory=time.time)
 
     async def __aenter__(self) -> Self:
+        self._written_future = asyncio.get_running_loop().create_future()
+        self._written_future.set_result(None)
         await self._task_group.__aenter__()
         self._send_heartbeat_task = self._task_group.create_task(asyncio.sleep(0))
         self._active_connection_state = await self._get_active_connection_state(is_initial_call=True)
@@ -89,6 +114,8 @@ class ConnectionManager:
         try:
             await self._task_group.__aexit__(exc_type, exc_value, traceback)
         finally:
+            if self.outbox is not None:
+                self.outbox.fail_all(ClientClosedError())
             await self._close_active_connection_state()
 
     async def _close_active_connection_state(self) -> None:
@@ -152,6 +179,7 @@ class ConnectionManager:
     async def _create_connection_to_one_server(
         self, server: ConnectionParameters
     ) -> tuple[AbstractConnection, ConnectionParameters] | None:
+        started_at = self.server_health.clock()
         if connection := await self.connection_class.connect(
             host=server.host,
             port=server.port,
@@ -160,16 +188,72 @@ class ConnectionManager:
             ssl=self.ssl,
             ws_uri_path=server.ws_uri_path,
         ):
+            # Optional for connections: those that don't have a socket of their own don't implement it
+            if (apply_socket_options := getattr(connection, "apply_socket_options", None)) is not None:
+                try:
+                    apply_socket_options(server.socket_options)
+                except OSError as error:
+                    # E.g. socket was reset by peer right after connecting, or an option isn't supported
+                    LOGGER.warning(
+                        "failed to apply socket options, dropping connection. error: %r, connection_parameters: %s",
+                        error,
+                        server,
+                    )
+                    await connection.close()
+                    self.server_health.record_failure(server)
+                    return None
+            connection.frame_parser_factory = self.frame_parser_factory
+            connection.write_coalescing_window = self.write_coalescing_window
+            connection.max_queued_send_frames = self.max_queued_send_frames
+            self.server_health.record_connect(server, self.server_health.clock() - started_at)
             return (connection, server)
+        self.server_health.record_failure(server)
         return None
 
     async def _create_connection_to_any_server(self) -> tuple[AbstractConnection, ConnectionParameters] | None:
-        for maybe_connection_future in asyncio.as_completed(
-            [self._create_connection_to_one_server(server) for server in self.servers]
-        ):
-            if connection_and_server := await maybe_connection_future:
-                return connection_and_server
-        return None
+        """Race connection attempts to servers, healthiest first (see `ServerHealthTracker.order()`).
+
+        Next attempt starts when previous one fails or after `connect_stagger_delay`. First established connection
+        wins: pending attempts are cancelled, connections that are established anyway are closed. If an attempt raises,
+        established connections are closed as well and the error is raised.
+        """
+        not_started_servers = iter(self.server_health.order(self.servers))
+        pending_attempts: set[asyncio.Task[tuple[AbstractConnection, ConnectionParameters] | None]] = set()
+        try:
+            while True:
+                if server := next(not_started_servers, None):
+                    pending_attempts.add(asyncio.create_task(self._create_connection_to_one_server(server)))
+                    timeout = self.connect_stagger_delay.total_seconds()
+                elif pending_attempts:
+                    timeout = None
+                else:
+                    return None
+
+                finished_attempts, pending_attempts = await asyncio.wait(
+                    pending_attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                results = await asyncio.gather(*finished_attempts, return_exceptions=True)
+                established = [result for result in results if isinstance(result, tuple)]
+                if errors := [result for result in results if isinstance(result, BaseException)]:
+                    for connection, _ in established:
+                        await connection.close()
+                    raise errors[0]
+                if established:
+                    for connection, _ in established[1:]:
+                        await connection.close()
+                    return established[0]
+        finally:
+            await self._cancel_connection_attempts(pending_attempts)
+
+    @staticmethod
+    async def _cancel_connection_attempts(
+        attempts: set[asyncio.Task[tuple[AbstractConnection, ConnectionParameters] | None]],
+    ) -> None:
+        for attempt in attempts:
+            attempt.cancel()
+        for result in await asyncio.gather(*attempts, return_exceptions=True):
+            if isinstance(result, tuple):
+                await result[0].close()
 
     async def _connect_to_any_server(self) -> ActiveConnectionState | AnyConnectionIssue:
         from stompman.connection_lifespan import EstablishedConnectionResult  # ruff: ignore[import-outside-top-level]
@@ -184,6 +268,7 @@ class ConnectionManager:
         )
 
         connection_established = False
+        started_at = self.server_health.clock()
         try:
             try:
                 connection_result = await lifespan.enter()
@@ -192,6 +277,7 @@ class ConnectionManager:
 
             if isinstance(connection_result, EstablishedConnectionResult):
                 connection_established = True
+                self.server_health.record_confirmation(connection_parameters, self.server_health.clock() - started_at)
                 return ActiveConnectionState(
                     connection=connection,
                     lifespan=lifespan,
@@ -201,6 +287,7 @@ class ConnectionManager:
             return connection_result
         finally:
             if not connection_established:
+                self.server_health.record_failure(connection_parameters)
                 await connection.close()
 
     async def _get_active_connection_state(self, *, is_initial_call: bool = False) -> ActiveConnectionState:
@@ -213,13 +300,16 @@ class ConnectionManager:
             if self._active_connection_state:
                 return self._active_connection_state
 
-            for attempt in range(self.connect_retry_attempts):
+            retry_policy = self.retry_policy or ExponentialBackoff(base_delay=self.connect_retry_interval)
+            retry_delay: float | None = None
+            for _ in range(self.connect_retry_attempts):
                 connection_result = await self._connect_to_any_server()
 
                 if isinstance(connection_result, ActiveConnectionState):
                     self._active_connection_state = connection_result
                     self._last_message_received_time = time.time()
                     self._restart_no_message_monitor()
+                    self._start_flushing_outbox()
                     if not is_initial_call:
                         LOGGER.warning(
                             "reconnected after connection failure. connection_parameters: %s",
@@ -228,9 +318,13 @@ class ConnectionManager:
                     return connection_result
 
                 connection_issues.append(connection_result)
-                await asyncio.sleep(self.connect_retry_interval * (attempt + 1))
+                retry_delay = retry_policy.get_delay(retry_delay)
+                await asyncio.sleep(retry_delay)
 
-        raise FailedAllConnectAttemptsError(retry_attempts=self.connect_retry_attempts, issues=connection_issues)
+        error = FailedAllConnectAttemptsError(retry_attempts=self.connect_retry_attempts, issues=connection_issues)
+        if self.outbox is not None:
+            self.outbox.fail_all(error)
+        raise error
 
     async def _discard_failed_connection_state(
         self,
@@ -246,6 +340,7 @@ class ConnectionManager:
         )
         self._active_connection_state = None
         self._reconnection_count += 1
+        self.server_health.record_connection_lost(connection_state.lifespan.connection_parameters)
         await connection_state.connection.close()
 
     async def write_heartbeat_reconnecting(self) -> None:
@@ -268,6 +363,76 @@ class ConnectionManager:
 
         raise FailedAllWriteAttemptsError(retry_attempts=self.write_retry_attempts)
 
+    async def write_frame_parts_reconnecting(
+        self, parts: list[BytesLike], build_frame: Callable[[], AnyClientFrame]
+    ) -> None:
+        for _ in range(self.write_retry_attempts):
+            connection_state = await self._get_active_connection_state()
+            try:
+                return await write_frame_parts_or_frame(connection_state.connection, parts, build_frame)
+            except ConnectionLostError as error:
+                await self._discard_failed_connection_state(connection_state, error)
+
+        raise FailedAllWriteAttemptsError(retry_attempts=self.write_retry_attempts)
+
+    def _start_flushing_outbox(self) -> None:
+        if (
+            self.outbox
+            and self._active_connection_state
+            and (self._flush_outbox_task is None or self._flush_outbox_task.done())
+        ):
+            self._flush_outbox_task = self._task_group.create_task(self._flush_outbox(self.outbox))
+
+    async def _flush_outbox(self, outbox: Outbox) -> None:
+        while (frame := outbox.peek()) is not None and (connection_state := self._active_connection_state):
+            try:
+                await connection_state.connection.write_frame(frame)
+            except ConnectionLostError as error:
+                await self._discard_failed_connection_state(connection_state, error)
+                return
+            outbox.pop_written()
+
+    async def send_frame(self, frame: SendFrame) -> asyncio.Future[None]:
+        """Write SEND frame, or put it to outbox if there's no connection or outbox isn't empty yet.
+
+        Without outbox, waits for reconnection like `write_frame_reconnecting()`. Returned future is done when frame is
+        written to connection. Frames sent in transactions don't go through here and so aren't ordered with these.
+        """
+        if self.outbox is None:
+            await self.write_frame_reconnecting(frame)
+            return self._written_future
+        return await self._send_with_outbox(
+            self.outbox, lambda connection: connection.write_frame(frame), lambda: frame
+        )
+
+    async def send_frame_parts(
+        self, parts: list[BytesLike], build_frame: Callable[[], SendFrame]
+    ) -> asyncio.Future[None]:
+        """Like `send_frame()`, for frame serialized in advance. `build_frame()` is called if parts can't be written."""
+        if self.outbox is None:
+            await self.write_frame_parts_reconnecting(parts, build_frame)
+            return self._written_future
+        return await self._send_with_outbox(
+            self.outbox, lambda connection: write_frame_parts_or_frame(connection, parts, build_frame), build_frame
+        )
+
+    async def _send_with_outbox(
+        self,
+        outbox: Outbox,
+        write: Callable[[AbstractConnection], Awaitable[None]],
+        build_frame: Callable[[], SendFrame],
+    ) -> asyncio.Future[None]:
+        if (connection_state := self._active_connection_state) and outbox.is_empty():
+            try:
+                await write(connection_state.connection)
+            except ConnectionLostError as error:
+                await self._discard_failed_connection_state(connection_state, error)
+            else:
+                return self._written_future
+        written = await outbox.put(build_frame())
+        self._start_flushing_outbox()
+        return written
+
     async def read_frames_reconnecting(self) -> AsyncGenerator[tuple[AnyServerFrame, int], None]:
         while True:
             try:
@@ -281,6 +446,8 @@ class ConnectionManager:
             epoch = self._reconnection_count
             try:
                 async for frame in connection_state.connection.read_frames():
+                    if isinstance(frame, ErrorFrame):
+                        self.server_health.record_error_frame(connection_state.lifespan.connection_parameters)
                     yield frame, epoch
             except ConnectionLostError as error:
                 await self._discard_failed_connection_state(connection_state, error)
@@ -296,3 +463,26 @@ class ConnectionManager:
             await self._discard_failed_connection_state(connection_state, error)
             return False
         return True
+
+    async def maybe_write_ack_frame(
+        self, frame_type: type[AckFrame | NackFrame], *, ack_id: str, subscription_id: str, parts: list[BytesLike]
+    ) -> bool:
+        """Write ACK/NACK frame serialized by `dump_ack_frame()`, unless there's no connection."""
+        if not (connection_state := self._active_connection_state):
+            _log_dropped_ack_frame(
+                frame_type, ack_id=ack_id, subscription_id=subscription_id, reason="no active connection"
+            )
+            return False
+        try:
+            await write_frame_parts_or_frame(
+                connection_state.connection,
+                parts,
+                lambda: frame_type(headers={"id": ack_id, "subscription": subscription_id}),
+            )
+        except ConnectionLostError as error:
+            _log_dropped_ack_frame(
+                frame_type, ack_id=ack_id, subscription_id=subscription_id, reason="connection lost mid-write"
+            )
+            await self._discard_failed_connection_state(connection_state, error)
+            return False
+        return True
@@ -0,0 +1,169 @@
+import asyncio
+import socket
+from collections import deque
+from dataclasses import dataclass, field
+from ssl import SSLContext
+from typing import Final, Literal, Self
+
+from stompman.connection import Connection
+
+# Reading from socket is paused while this many received chunks are not read yet
+MAX_PENDING_CHUNKS: Final = 4
+MIN_READ_CHUNK_SIZE: Final = 4 * 1024
+
+
+class BufferedStreamReader(asyncio.StreamReader):
+    """Stream reader that returns chunks received by `BufferedStreamProtocol` as they are, without buffering them."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: deque[bytes] = deque()
+        self._chunks_waiter: asyncio.Future[None] | None = None
+        self._read_transport: asyncio.ReadTransport | None = None
+        self._is_reading_paused = False
+
+    def set_transport(self, transport: asyncio.BaseTransport) -> None:
+        super().set_transport(transport)
+        self._read_transport = transport  # type: ignore[assignment]
+
+    def feed_data(self, data: bytes) -> None:  # type: ignore[override]
+        self._chunks.append(data)
+        if len(self._chunks) >= MAX_PENDING_CHUNKS and self._read_transport is not None:
+            self._read_transport.pause_reading()
+            self._is_reading_paused = True
+        self._wake_up()
+
+    def feed_eof(self) -> None:
+        super().feed_eof()
+        self._wake_up()
+
+    def set_exception(self, exc: Exception) -> None:
+        super().set_exception(exc)
+        self._wake_up()
+
+    def _wake_up(self) -> None:
+        if self._chunks_waiter is not None and not self._chunks_waiter.done():
+            self._chunks_waiter.set_result(None)
+
+    async def read(self, n: int = -1) -> bytes:
+        while not self._chunks:
+            if (exception := self.exception()) is not None:
+                raise exception
+            if self.at_eof():
+                return b""
+            self._chunks_waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._chunks_waiter
+            finally:
+                self._chunks_waiter = None
+
+        parts = [self._chunks.popleft()]
+        size = len(parts[0])
+        while self._chunks and (n < 0 or size + len(self._chunks[0]) <= n):
+            size += len(self._chunks[0])
+            parts.append(self._chunks.popleft())
+        if self._is_reading_paused and len(self._chunks) < MAX_PENDING_CHUNKS and self._read_transport is not None:
+            self._is_reading_paused = False
+            self._read_transport.resume_reading()
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+
+@dataclass(kw_only=True, slots=True)
+class AdaptiveReadChunkSize:
+    """Size of the buffer for next read: doubles while reads fill it, halves while they use less than a quarter of it.
+
+    Idle connections that only receive heartbeats settle at `min_size`, busy ones grow to `max_size`.
+    """
+
+    min_size: int
+    max_size: int
+    current: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.min_size = min(self.min_size, self.max_size)
+        self.current = self.min_size
+
+    def update(self, bytes_read: int) -> None:
+        if bytes_read >= self.current:
+            self.current = min(self.current * 2, self.max_size)
+        elif bytes_read < self.current // 4:
+            self.current = max(self.current // 2, self.min_size)
+
+
+class BufferedStreamProtocol(asyncio.StreamReaderProtocol, asyncio.BufferedProtocol):
+    """Receives socket data into one reusable buffer, instead of a new bytes object for each read.
+
+    Buffer is reallocated when `AdaptiveReadChunkSize` changes, so idle connections don't hold `buffer_size` bytes.
+    Writing side (flow control for `drain()`, close waiter) is inherited from `asyncio.StreamReaderProtocol`.
+    """
+
+    def __init__(self, stream_reader: BufferedStreamReader, buffer_size: int) -> None:
+        super().__init__(stream_reader)
+        self._buffered_stream_reader = stream_reader
+        self._buffer_size = AdaptiveReadChunkSize(min_size=MIN_READ_CHUNK_SIZE, max_size=buffer_size)
+        self._buffer = memoryview(bytearray(self._buffer_size.current))
+
+    @property
+    def buffer_size(self) -> int:
+        """Size of the buffer for next read from socket, at most `buffer_size` passed to constructor."""
+        return self._buffer_size.current
+
+    def get_buffer(self, sizehint: int) -> memoryview:  # ruff: ignore[unused-method-argument]
+        if len(self._buffer) != self._buffer_size.current:
+            self._buffer = memoryview(bytearray(self._buffer_size.current))
+        return self._buffer
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._buffer_size.update(nbytes)
+        # Parsed frames keep slices of chunks, so data is copied once out of the reusable buffer
+        self._buffered_stream_reader.feed_data(self._buffer[:nbytes].tobytes())
+
+
+@dataclass(kw_only=True, slots=True)
+class BufferedProtocolConnection(Connection):
+    """Connection that reads from socket into a reusable buffer of at most `read_max_chunk_size` bytes.
+
+    Compared to `Connection`, each read skips `asyncio.StreamReader` buffer and the bytes object that transport
+    allocates for received data. Buffer size adapts to traffic, see `read_buffer_size`.
+    """
+
+    protocol: BufferedStreamProtocol
+
+    @property
+    def read_buffer_size(self) -> int:
+        """Current size of the buffer that next read from socket goes to: from 4 KiB up to `read_max_chunk_size`."""
+        return self.protocol.buffer_size
+
+    @classmethod
+    async def connect(
+        cls,
+        *,
+        host: str,
+        port: int,
+        timeout: int,
+        read_max_chunk_size: int,
+        ssl: Literal[True] | SSLContext | None,
+        ws_uri_path: str | None = None,
+    ) -> Self | None:
+        loop = asyncio.get_running_loop()
+        reader = BufferedStreamReader()
+        try:
+            if ws_uri_path:
+                msg = "only stompman.connection_ws.WebSocketConnection supports ws_uri_path argument"
+                raise AssertionError(msg)
+            transport, protocol = await asyncio.wait_for(
+                loop.create_connection(
+                    lambda: BufferedStreamProtocol(reader, read_max_chunk_size), host=host, port=port, ssl=ssl
+                ),
+                timeout=timeout,
+            )
+        except (TimeoutError, ConnectionError, socket.gaierror):
+            return None
+        else:
+            return cls(
+                reader=reader,
+                writer=asyncio.StreamWriter(transport, protocol, reader, loop),
+                read_max_chunk_size=read_max_chunk_size,
+                ssl=ssl,
+                protocol=protocol,
+            )
@@ -0,0 +1,46 @@
+import asyncio
+from dataclasses import dataclass
+from ssl import SSLContext
+from typing import Literal, Self
+
+from stompman.connection import Connection
+
+
+@dataclass(kw_only=True, slots=True)
+class UnixSocketConnection(Connection):
+    """Connection over Unix domain socket, for brokers running on the same host.
+
+    `ConnectionParameters.host` is path to the socket, `port` is ignored:
+
+    .. code-block:: python
+        async with stompman.Client(
+            servers=[stompman.ConnectionParameters(host="/run/artemis/stomp.sock", port=0, login="", passcode="")],
+            connection_class=UnixSocketConnection,
+        ):
+            ...
+    """
+
+    @classmethod
+    async def connect(
+        cls,
+        *,
+        host: str,
+        port: int,
+        timeout: int,
+        read_max_chunk_size: int,
+        ssl: Literal[True] | SSLContext | None,
+        ws_uri_path: str | None = None,
+    ) -> Self | None:
+        del port
+        if ws_uri_path:
+            msg = "only stompman.connection_ws.WebSocketConnection supports ws_uri_path argument"
+            raise AssertionError(msg)
+        if ssl:
+            msg = "stompman.connection_unix.UnixSocketConnection doesn't support ssl"
+            raise AssertionError(msg)
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(host), timeout=timeout)
+        except (TimeoutError, OSError):
+            return None
+        else:
+            return cls(reader=reader, writer=writer, read_max_chunk_size=read_max_chunk_size, ssl=ssl)
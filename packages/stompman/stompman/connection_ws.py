@@ -1,23 +1,67 @@
 import asyncio
 import time
-from collections.abc import AsyncGenerator, Iterator
+from collections.abc import AsyncGenerator
 from contextlib import suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from ssl import SSLContext
-from typing import Literal, Self, cast
+from typing import ClassVar, Literal, Self
 
 import websockets  # type: ignore[import-not-found,unused-ignore]
+from websockets.extensions.permessage_deflate import (  # type: ignore[import-not-found,unused-ignore]
+    ClientPerMessageDeflateFactory,
+)
 
-from stompman.connection import AbstractConnection, reraise_connection_lost
-from stompman.frames import AnyClientFrame, AnyServerFrame
-from stompman.serde import NEWLINE, FrameParser, dump_frame
+from stompman.config import SocketOptions
+from stompman.connection import AbstractConnection, parse_frames_reraising_connection_lost, reraise_connection_lost
+from stompman.errors import ConnectionLostError
+from stompman.frames import AnyClientFrame, AnyServerFrame, BytesLike
+from stompman.serde import NEWLINE, dump_frame
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class WebSocketCompression:
+    """permessage-deflate settings. Defaults are the same as in `websockets`."""
+
+    level: int = 6
+    """zlib compression level: 1 is fastest, 9 is smallest."""
+    memory_level: int = 5
+    """zlib memory level: 1 uses least memory, 9 is fastest."""
+    client_max_window_bits: int | None = None
+    """Window size for messages sent by client, 9-15. None lets server choose."""
+    server_max_window_bits: int | None = None
+    """Window size for messages sent by server, 9-15. None lets server choose."""
+
+    def make_extension_factory(self) -> ClientPerMessageDeflateFactory:
+        return ClientPerMessageDeflateFactory(
+            server_max_window_bits=self.server_max_window_bits,
+            client_max_window_bits=self.client_max_window_bits or True,
+            compress_settings={"level": self.level, "memLevel": self.memory_level},
+        )
 
 
 @dataclass(kw_only=True)
 class WebSocketConnection(AbstractConnection):
+    """Connection over websocket.
+
+    To change framing or compression, subclass it and override class variables:
+
+    .. code-block:: python
+        class CompressedWebSocketConnection(WebSocketConnection):
+            binary_frames = True
+            compression = WebSocketCompression(level=1, client_max_window_bits=12)
+    """
+
+    binary_frames: ClassVar[bool] = False
+    """Send STOMP frames in binary websocket messages instead of text ones, so that bodies aren't UTF-8 validated."""
+    compression: ClassVar[WebSocketCompression | None] = WebSocketCompression()
+    """Offer permessage-deflate with these settings. None to disable compression."""
+
     websocket: websockets.ClientConnection
     read_max_chunk_size: int
     ssl: Literal[True] | SSLContext | None
+    _heartbeat_task: asyncio.Task[None] | None = field(init=False, default=None)
+    _heartbeat_error: ConnectionLostError | None = field(init=False, default=None)
+    _wrote_since_heartbeat: bool = field(init=False, default=False)
 
     @classmethod
     async def connect(
@@ -34,32 +78,68 @@ class WebSocketConnection(AbstractConnection):
             path = f"{ws_uri_path.strip('/')}" if ws_uri_path else ""
             uri = f"ws://{host}:{port}/{path}"
             websocket = await asyncio.wait_for(
-                websockets.connect(uri=uri, ssl=ssl, max_size=read_max_chunk_size), timeout=timeout
+                websockets.connect(
+                    uri=uri,
+                    ssl=ssl,
+                    max_size=read_max_chunk_size,
+                    compression=None,
+                    extensions=[cls.compression.make_extension_factory()] if cls.compression else None,
+                ),
+                timeout=timeout,
             )
         except (TimeoutError, OSError, websockets.WebSocketException):
             return None
         else:
             return cls(websocket=websocket, read_max_chunk_size=read_max_chunk_size, ssl=ssl)
 
+    def apply_socket_options(self, options: SocketOptions) -> None:
+        if (sock := self.websocket.transport.get_extra_info("socket")) is not None:
+            options.apply(sock)
+
     async def close(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
         with suppress(websockets.WebSocketException):
             await self.websocket.close()
 
     def write_heartbeat(self) -> None:
-        with reraise_connection_lost(RuntimeError, OSError, websockets.WebSocketException):
-            asyncio.run_coroutine_threadsafe(self.websocket.send(NEWLINE, text=True), loop=asyncio.get_running_loop())
+        """Send heartbeat in background task. Failure of previous heartbeat is raised here.
+
+        Skipped if frames were written since previous heartbeat, or if previous heartbeat is still being sent.
+        """
+        if self._heartbeat_error is not None:
+            raise self._heartbeat_error
+        if self._wrote_since_heartbeat:
+            self._wrote_since_heartbeat = False
+            return
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            with reraise_connection_lost(RuntimeError):
+                self._heartbeat_task = asyncio.create_task(self._send_heartbeat())
+
+    async def _send_heartbeat(self) -> None:
+        try:
+            with reraise_connection_lost(RuntimeError, OSError, websockets.WebSocketException):
+                await self.websocket.send(NEWLINE, text=not self.binary_frames)
+        except ConnectionLostError as error:
+            self._heartbeat_error = error
 
     async def write_frame(self, frame: AnyClientFrame) -> None:
         with reraise_connection_lost(RuntimeError, OSError, websockets.WebSocketException):
-            await self.websocket.send(dump_frame(frame), text=True)
+            await self.websocket.send(dump_frame(frame), text=not self.binary_frames)
+        self._wrote_since_heartbeat = True
+
+    async def write_frame_parts(self, parts: list[BytesLike]) -> None:
+        with reraise_connection_lost(RuntimeError, OSError, websockets.WebSocketException):
+            await self.websocket.send(b"".join(parts), text=not self.binary_frames)
+        self._wrote_since_heartbeat = True
 
     async def read_frames(self) -> AsyncGenerator[AnyServerFrame, None]:
-        parser = FrameParser()
+        parser = self.frame_parser_factory()
 
         while True:
             with reraise_connection_lost(RuntimeError, OSError, websockets.WebSocketException):
                 raw_frames = await self.websocket.recv(decode=False)
             self.last_read_time = time.time()
 
-            for frame in cast("Iterator[AnyServerFrame]", parser.parse_frames_from_chunk(raw_frames)):
+            for frame in parse_frames_reraising_connection_lost(parser, raw_frames):
                 yield frame
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 from stompman.config import ConnectionParameters  # noqa: TC001
-from stompman.frames import ErrorFrame, HeartbeatFrame, MessageFrame, ReceiptFrame
+from stompman.frames import ErrorFrame, HeartbeatFrame, MessageFrame, RawMessageFrame, ReceiptFrame
 
 
 @dataclass(kw_only=True)
@@ -17,10 +17,19 @@ class ConnectionLostError(Error):
     reason: Exception | str
 
 
+@dataclass(kw_only=True)
+class FrameLimitExceededError(Error):
+    """Raised in stompman.FrameParser when incoming frame is bigger than one of configured limits."""
+
+    limit_name: str
+    limit: int
+    value: int
+
+
 @dataclass(frozen=True, kw_only=True, slots=True)
 class ConnectionConfirmationTimeout:
     timeout: int
-    frames: list[MessageFrame | ReceiptFrame | ErrorFrame | HeartbeatFrame]
+    frames: list[MessageFrame | RawMessageFrame | ReceiptFrame | ErrorFrame | HeartbeatFrame]
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -52,3 +61,8 @@ class FailedAllConnectAttemptsError(Error):
 @dataclass(kw_only=True)
 class FailedAllWriteAttemptsError(Error):
     retry_attempts: int
+
+
+@dataclass(kw_only=True)
+class ClientClosedError(Error):
+    """Set to futures of frames that were left in stompman.Outbox when client exited."""
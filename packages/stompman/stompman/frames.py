@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import Literal, NotRequired, Self, TypedDict
+from typing import Literal, NotRequired, Self, TypedDict, cast
+
+BytesLike = bytes | bytearray | memoryview
 
 ConnectHeaders = TypedDict(
     "ConnectHeaders",
@@ -139,13 +141,13 @@ class ConnectedFrame:
 @dataclass(frozen=True, kw_only=True, slots=True)
 class SendFrame:
     headers: SendHeaders
-    body: bytes = b""
+    body: BytesLike = b""
 
     @classmethod
     def build(
         cls,
         *,
-        body: bytes,
+        body: BytesLike,
         destination: str,
         transaction: str | None,
         content_type: str | None,
@@ -155,7 +157,7 @@ class SendFrame:
         all_headers: SendHeaders = headers or {}  # type: ignore[assignment]
         all_headers["destination"] = destination
         if add_content_length:
-            all_headers["content-length"] = str(len(body))
+            all_headers["content-length"] = str(body.nbytes if isinstance(body, memoryview) else len(body))
         if content_type is not None:
             all_headers["content-type"] = content_type
         if transaction is not None:
@@ -220,6 +222,25 @@ class MessageFrame:
     body: bytes
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class RawMessageFrame:
+    """MESSAGE frame for raw subscriptions: body is not copied from read buffer.
+
+    Headers of received frames are a read-only mapping (`stompman.serde.LazyHeaders`) that decodes them on access.
+    """
+
+    command: bytes
+    headers: MessageHeaders
+    body: memoryview
+
+    @classmethod
+    def from_message_frame(cls, frame: MessageFrame) -> Self:
+        return cls(command=b"MESSAGE", headers=frame.headers, body=memoryview(frame.body))
+
+    def to_message_frame(self) -> MessageFrame:
+        return MessageFrame(headers=cast("MessageHeaders", dict(self.headers)), body=self.body.tobytes())
+
+
 @dataclass(frozen=True, kw_only=True, slots=True)
 class ErrorFrame:
     headers: ErrorHeaders
@@ -244,4 +265,4 @@ AnyClientFrame = (
     | StompFrame
 )
 AnyRealServerFrame = ConnectedFrame | MessageFrame | ReceiptFrame | ErrorFrame
-AnyServerFrame = AnyRealServerFrame | HeartbeatFrame
+AnyServerFrame = AnyRealServerFrame | RawMessageFrame | HeartbeatFrame
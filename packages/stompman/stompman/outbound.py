@@ -0,0 +1,112 @@
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from stompman.errors import ConnectionLostError
+from stompman.frames import BytesLike
+from stompman.serde import NEWLINE
+
+QueuedFrame = tuple[list[BytesLike], asyncio.Future[None]]
+
+
+@dataclass(kw_only=True, slots=True)
+class OutboundScheduler:
+    """Writes frames of one connection from a single task, so that control traffic isn't stuck behind SEND frames.
+
+    Each write puts the whole batch on the wire: pending heartbeat, all queued control frames and at most one SEND
+    frame. Writers wait until their frame is drained. At most `max_queued_send_frames` SEND frames are queued, further
+    senders wait for a free slot.
+    """
+
+    write: Callable[[list[BytesLike]], Awaitable[None]]
+    max_queued_send_frames: int
+    _heartbeat_pending: bool = field(init=False, default=False)
+    _control_lane: deque[QueuedFrame] = field(init=False, default_factory=deque)
+    _send_lane: deque[QueuedFrame] = field(init=False, default_factory=deque)
+    _send_lane_slots: asyncio.Semaphore = field(init=False)
+    _wakeup: asyncio.Event = field(init=False, default_factory=asyncio.Event)
+    _writer_task: asyncio.Task[None] | None = field(init=False, default=None)
+    _in_flight: list[asyncio.Future[None]] = field(init=False, default_factory=list)
+    _error: ConnectionLostError | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._send_lane_slots = asyncio.Semaphore(self.max_queued_send_frames)
+
+    def write_heartbeat(self) -> None:
+        self._raise_if_failed()
+        self._heartbeat_pending = True
+        self._wake_writer()
+
+    async def write_control_frame(self, parts: list[BytesLike]) -> None:
+        await self._enqueue(self._control_lane, parts)
+
+    async def write_send_frame(self, parts: list[BytesLike]) -> None:
+        async with self._send_lane_slots:
+            await self._enqueue(self._send_lane, parts)
+
+    def close(self) -> None:
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self._fail(ConnectionLostError(reason="connection closed"))
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def _enqueue(self, lane: deque[QueuedFrame], parts: list[BytesLike]) -> None:
+        self._raise_if_failed()
+        future = asyncio.get_running_loop().create_future()
+        lane.append((parts, future))
+        self._wake_writer()
+        await future
+
+    def _wake_writer(self) -> None:
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._write_forever())
+        self._wakeup.set()
+
+    def _take_batch(self) -> tuple[list[BytesLike], list[asyncio.Future[None]]]:
+        parts: list[BytesLike] = []
+        futures: list[asyncio.Future[None]] = []
+        if self._heartbeat_pending:
+            self._heartbeat_pending = False
+            parts.append(NEWLINE)
+        while self._control_lane:
+            frame_parts, future = self._control_lane.popleft()
+            if not future.cancelled():
+                parts.extend(frame_parts)
+                futures.append(future)
+        while self._send_lane:
+            frame_parts, future = self._send_lane.popleft()
+            if not future.cancelled():
+                parts.extend(frame_parts)
+                futures.append(future)
+                break
+        return parts, futures
+
+    async def _write_forever(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                parts, self._in_flight = self._take_batch()
+                if not parts:
+                    break
+                try:
+                    await self.write(parts)
+                except ConnectionLostError as error:
+                    self._fail(error)
+                    return
+                for future in self._in_flight:
+                    if not future.done():
+                        future.set_result(None)
+
+    def _fail(self, error: ConnectionLostError) -> None:
+        self._error = error
+        for future in (*self._in_flight, *(future for _, future in (*self._control_lane, *self._send_lane))):
+            if not future.done():
+                future.set_exception(error)
+        self._in_flight.clear()
+        self._control_lane.clear()
+        self._send_lane.clear()
@@ -0,0 +1,99 @@
+import asyncio
+import dataclasses
+from collections import deque
+from dataclasses import dataclass, field
+
+from stompman.frames import SendFrame
+
+
+def _retrieve_exception(future: asyncio.Future[None]) -> None:
+    # Handles are optional to await, failed ones shouldn't be reported as "exception was never retrieved"
+    if not future.cancelled():
+        future.exception()
+
+
+@dataclass(kw_only=True, slots=True)
+class OutboxItem:
+    frame: SendFrame
+    size: int
+    written: asyncio.Future[None]
+
+
+@dataclass(kw_only=True, slots=True)
+class Outbox:
+    """SEND frames accepted while client is disconnected, written in order after it reconnects.
+
+    `put()` waits while there are `max_frames` frames or `max_bytes` bytes of bodies in outbox. A frame with body bigger
+    than `max_bytes` is accepted when outbox is empty. Waiting frames are put in the order `put()` was called.
+
+    Bodies that are not `bytes` are copied when put, so caller can reuse its buffers right after `put()` returns.
+    """
+
+    max_frames: int | None = None
+    max_bytes: int | None = None
+    _items: deque[OutboxItem] = field(init=False, default_factory=deque)
+    _size: int = field(init=False, default=0)
+    _space_waiters: deque[asyncio.Future[None]] = field(init=False, default_factory=deque)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def is_empty(self) -> bool:
+        """No frames in outbox and none waiting for space. Only then frames may be written bypassing outbox."""
+        return not self._items and not self._space_waiters
+
+    def _has_space_for(self, size: int) -> bool:
+        if not self._items:
+            return True
+        if self.max_frames is not None and len(self._items) >= self.max_frames:
+            return False
+        return self.max_bytes is None or self._size + size <= self.max_bytes
+
+    async def put(self, frame: SendFrame) -> asyncio.Future[None]:
+        """Add frame to outbox, waiting for space. Returned future is done when frame is written to connection."""
+        if not isinstance(frame.body, bytes):
+            frame = dataclasses.replace(frame, body=bytes(frame.body))
+        size = len(frame.body)
+        if self._space_waiters or not self._has_space_for(size):
+            await self._wait_for_space(size)
+
+        written = asyncio.get_running_loop().create_future()
+        written.add_done_callback(_retrieve_exception)
+        self._items.append(OutboxItem(frame=frame, size=size, written=written))
+        self._size += size
+        return written
+
+    async def _wait_for_space(self, size: int) -> None:
+        # Only the first waiter is woken up, so frames that wait for space can't be overtaken by later ones
+        waiter = asyncio.get_running_loop().create_future()
+        self._space_waiters.append(waiter)
+        try:
+            await waiter
+            while not self._has_space_for(size):
+                waiter = self._space_waiters[0] = asyncio.get_running_loop().create_future()
+                await waiter
+        finally:
+            self._space_waiters.remove(waiter)
+            self._wake_up_first_space_waiter()
+
+    def peek(self) -> SendFrame | None:
+        return self._items[0].frame if self._items else None
+
+    def pop_written(self) -> None:
+        item = self._items.popleft()
+        self._size -= item.size
+        if not item.written.done():
+            item.written.set_result(None)
+        self._wake_up_first_space_waiter()
+
+    def fail_all(self, error: Exception) -> None:
+        """Drop all frames, setting `error` to their futures."""
+        while self._items:
+            if not (item := self._items.popleft()).written.done():
+                item.written.set_exception(error)
+        self._size = 0
+        self._wake_up_first_space_waiter()
+
+    def _wake_up_first_space_waiter(self) -> None:
+        if self._space_waiters and not (waiter := self._space_waiters[0]).done():
+            waiter.set_result(None)
@@ -0,0 +1,35 @@
+import random
+from dataclasses import dataclass
+from typing import Protocol
+
+
+class RetryPolicy(Protocol):
+    def get_delay(self, previous_delay: float | None) -> float:
+        """Seconds to wait before next connection attempt. `previous_delay` is None after first failed attempt."""
+        ...
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ExponentialBackoff:
+    """Delay that grows exponentially from `base_delay` up to `max_delay` seconds.
+
+    With `jitter`, first delay is random between half of `base_delay` and `base_delay`, and each next one is random
+    between `base_delay` and three times previous delay (decorrelated jitter). So clients that lost connection to the
+    same broker at the same time don't reconnect in lockstep, and the first retry doesn't come right after the failure.
+    """
+
+    base_delay: float = 1
+    max_delay: float = 30
+    jitter: bool = True
+
+    def get_delay(self, previous_delay: float | None) -> float:
+        if not self.jitter:
+            delay = self.base_delay if previous_delay is None else previous_delay * 2
+        else:
+            lower, upper = (
+                (self.base_delay / 2, self.base_delay)
+                if previous_delay is None
+                else (self.base_delay, previous_delay * 3)
+            )
+            delay = random.uniform(lower, upper)  # ruff: ignore[suspicious-non-cryptographic-random-usage]
+        return min(delay, self.max_delay)
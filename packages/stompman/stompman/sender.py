@@ -0,0 +1,51 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from stompman.connection_manager import ConnectionManager
+from stompman.frames import BytesLike, SendFrame, SendHeaders
+from stompman.serde import NEWLINE, NULL, dump_frame_head
+
+
+@dataclass(kw_only=True, slots=True)
+class PreparedSender:
+    """Sends messages to one destination with the same headers. Header block is serialized once, in advance."""
+
+    destination: str
+    content_type: str | None
+    add_content_length: bool
+    headers: dict[str, str] | None
+    _connection_manager: ConnectionManager
+    _frame_headers: SendHeaders = field(init=False, repr=False)
+    _frame_head: bytes = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        headers = self.headers.copy() if self.headers else {}
+        if self.add_content_length:
+            headers.pop("content-length", None)
+        frame = SendFrame.build(
+            body=b"",
+            destination=self.destination,
+            transaction=None,
+            content_type=self.content_type,
+            add_content_length=False,
+            headers=headers,
+        )
+        self._frame_headers = frame.headers
+        self._frame_head = dump_frame_head(frame)
+
+    def _build_frame(self, body: BytesLike, content_length: int | None) -> SendFrame:
+        if content_length is None:
+            return SendFrame(headers=self._frame_headers, body=body)
+        return SendFrame(headers={**self._frame_headers, "content-length": str(content_length)}, body=body)
+
+    async def send(self, body: BytesLike) -> asyncio.Future[None]:
+        if self.add_content_length:
+            content_length = body.nbytes if isinstance(body, memoryview) else len(body)
+            frame_head = b"%bcontent-length:%d\n\n" % (self._frame_head, content_length)
+        else:
+            content_length = None
+            frame_head = self._frame_head + NEWLINE
+        return await self._connection_manager.send_frame_parts(
+            [frame_head, body, NULL] if body else [frame_head + NULL],
+            lambda: self._build_frame(body, content_length),
+        )
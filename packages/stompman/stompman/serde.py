@@ -1,9 +1,15 @@
-import struct
-from collections.abc import Iterator
+import mmap
+import re
+import sys
+import tempfile
+from collections.abc import Container, Iterable, Iterator, Mapping
 from contextlib import suppress
 from dataclasses import dataclass
-from typing import Any, Final, cast
+from functools import lru_cache
+from itertools import starmap
+from typing import IO, Any, Final, NoReturn, cast
 
+from stompman.errors import FrameLimitExceededError
 from stompman.frames import (
     AbortFrame,
     AckFrame,
@@ -11,6 +17,7 @@ from stompman.frames import (
     AnyRealServerFrame,
     AnyServerFrame,
     BeginFrame,
+    BytesLike,
     CommitFrame,
     ConnectedFrame,
     ConnectFrame,
@@ -18,7 +25,9 @@ from stompman.frames import (
     ErrorFrame,
     HeartbeatFrame,
     MessageFrame,
+    MessageHeaders,
     NackFrame,
+    RawMessageFrame,
     ReceiptFrame,
     SendFrame,
     StompFrame,
@@ -43,13 +52,33 @@ HEADER_UNESCAPE_CHARS: Final = {
     b"c": COLON_,
     BACKSLASH: BACKSLASH,
 }
+HEADER_ESCAPE_TABLE: Final = str.maketrans(HEADER_ESCAPE_CHARS)
+HEADER_CHARS_TO_ESCAPE_PATTERN: Final = re.compile(f"[{re.escape(''.join(HEADER_ESCAPE_CHARS))}]")
+# Invalid escape sequences and a trailing backslash are dropped
+HEADER_ESCAPE_SEQUENCE_PATTERN: Final = re.compile(rb"\\(.?)", re.DOTALL)
+# Keys of frequent headers are shared between all parsed frames instead of being decoded for each of them
+INTERNED_HEADER_KEYS: Final = {
+    key.encode(): sys.intern(key)
+    for key in (
+        "ack",
+        "content-length",
+        "content-type",
+        "destination",
+        "heart-beat",
+        "id",
+        "message",
+        "message-id",
+        "receipt",
+        "receipt-id",
+        "server",
+        "subscription",
+        "transaction",
+        "version",
+    )
+}
 
 
-def iter_bytes(bytes_: bytes | bytearray) -> tuple[bytes, ...]:
-    return struct.unpack(f"{len(bytes_)!s}c", bytes_)
-
-
-COMMANDS_TO_FRAMES: Final[dict[bytes, type[AnyClientFrame | AnyServerFrame]]] = {
+COMMANDS_TO_FRAMES: Final[dict[bytes, type[AnyClientFrame | AnyRealServerFrame]]] = {
     # Client frames
     b"SEND": SendFrame,
     b"SUBSCRIBE": SubscribeFrame,
@@ -70,153 +99,443 @@ COMMANDS_TO_FRAMES: Final[dict[bytes, type[AnyClientFrame | AnyServerFrame]]] =
 }
 FRAMES_TO_COMMANDS: Final = {value: key for key, value in COMMANDS_TO_FRAMES.items()}
 FRAMES_WITH_BODY: Final = (SendFrame, MessageFrame, ErrorFrame)
+# Parser buffer is reused between frames, unless a large frame made it grow over this size
+MAX_RETAINED_BUFFER_SIZE: Final = 64 * 1024
+
+
+def _escape_header_part(part: str) -> str:
+    return part.translate(HEADER_ESCAPE_TABLE) if HEADER_CHARS_TO_ESCAPE_PATTERN.search(part) else part
 
 
+@lru_cache(maxsize=1024)
 def dump_header(key: str, value: str) -> bytes:
-    escaped_key = "".join(HEADER_ESCAPE_CHARS.get(char, char) for char in key)
-    escaped_value = "".join(HEADER_ESCAPE_CHARS.get(char, char) for char in value)
-    return f"{escaped_key}:{escaped_value}\n".encode()
+    return f"{_escape_header_part(key)}:{_escape_header_part(value)}\n".encode()
+
+
+def dump_ack_frame_suffix(subscription_id: str) -> bytes:
+    """Dump `subscription` header and end of ACK/NACK frame, which is the same for all ACK/NACKs of subscription."""
+    return dump_header("subscription", subscription_id) + NEWLINE + NULL
+
+
+def dump_ack_frame(frame_type: type[AckFrame | NackFrame], *, ack_id: str, suffix: bytes) -> bytes:
+    """Dump ACK/NACK frame from suffix made by `dump_ack_frame_suffix()`, skipping frame and headers construction."""
+    return b"%b\nid:%b\n%b" % (FRAMES_TO_COMMANDS[frame_type], _escape_header_part(ack_id).encode(), suffix)
+
+
+def _dump_headers(frame: AnyClientFrame | AnyRealServerFrame) -> Iterable[bytes]:
+    if isinstance(frame, ConnectFrame):
+        return [f"{key}:{value}\n".encode() for key, value in frame.headers.items()]
+    return starmap(dump_header, frame.headers.items())
 
 
 def dump_frame(frame: AnyClientFrame | AnyRealServerFrame) -> bytes:
-    sorted_headers = sorted(frame.headers.items())
-    dumped_headers = (
-        (f"{key}:{value}\n".encode() for key, value in sorted_headers)
-        if isinstance(frame, ConnectFrame)
-        else (dump_header(key, cast("str", value)) for key, value in sorted_headers)
+    return b"".join(
+        (
+            FRAMES_TO_COMMANDS[type(frame)],
+            NEWLINE,
+            *_dump_headers(frame),
+            NEWLINE,
+            frame.body if isinstance(frame, FRAMES_WITH_BODY) else b"",
+            NULL,
+        )
     )
-    lines = (
-        FRAMES_TO_COMMANDS[type(frame)],
-        NEWLINE,
-        *dumped_headers,
-        NEWLINE,
-        frame.body if isinstance(frame, FRAMES_WITH_BODY) else b"",
-        NULL,
-    )
-    return b"".join(lines)
 
 
-def unescape_byte(*, byte: bytes, previous_byte: bytes | None) -> bytes | None:
-    if previous_byte == BACKSLASH:
-        return HEADER_UNESCAPE_CHARS.get(byte)
-    if byte == BACKSLASH:
-        return None
-    return byte
+def dump_frame_parts(frame: AnyClientFrame | AnyRealServerFrame) -> list[BytesLike]:
+    """Dump frame into buffers for `writelines()`: header block, body and NULL terminator. Body is not copied."""
+    if isinstance(frame, FRAMES_WITH_BODY) and frame.body:
+        return [b"".join((FRAMES_TO_COMMANDS[type(frame)], NEWLINE, *_dump_headers(frame), NEWLINE)), frame.body, NULL]
+    return [b"".join((FRAMES_TO_COMMANDS[type(frame)], NEWLINE, *_dump_headers(frame), NEWLINE, NULL))]
 
 
-def parse_header(buffer: bytearray) -> tuple[str, str] | None:
-    key_buffer = bytearray()
-    value_buffer = bytearray()
-    key_parsed = False
+def dump_frame_head(frame: AnyClientFrame | AnyRealServerFrame) -> bytes:
+    """Dump command and header lines of frame, without the empty line that ends headers."""
+    return b"".join((FRAMES_TO_COMMANDS[type(frame)], NEWLINE, *_dump_headers(frame)))
 
-    previous_byte = None
-    just_escaped_line = False
 
-    for byte in iter_bytes(buffer):
-        if byte == COLON_:
-            if key_parsed:
-                return None
-            key_parsed = True
-        elif just_escaped_line:
-            just_escaped_line = False
-            if byte != BACKSLASH:
-                (value_buffer if key_parsed else key_buffer).extend(byte)
-        elif unescaped_byte := unescape_byte(byte=byte, previous_byte=previous_byte):
-            just_escaped_line = True
-            (value_buffer if key_parsed else key_buffer).extend(unescaped_byte)
+def _unescape_header_part(raw_part: bytes) -> bytes:
+    return HEADER_ESCAPE_SEQUENCE_PATTERN.sub(lambda match: HEADER_UNESCAPE_CHARS.get(match[1], b""), raw_part)
 
-        previous_byte = byte
 
-    if key_parsed:
-        with suppress(UnicodeDecodeError):
-            return key_buffer.decode(), value_buffer.decode()
+def parse_header(buffer: bytes | bytearray) -> tuple[str, str] | None:
+    raw_key, colon, raw_value = bytes(buffer).partition(COLON_)
+    if not colon or COLON_ in raw_value:
+        return None
+    if BACKSLASH in buffer:
+        raw_key, raw_value = _unescape_header_part(raw_key), _unescape_header_part(raw_value)
 
+    with suppress(UnicodeDecodeError):
+        return INTERNED_HEADER_KEYS.get(raw_key) or raw_key.decode(), raw_value.decode()
     return None
 
 
-def make_frame_from_parts(*, command: bytes, headers: dict[str, str], body: bytes) -> AnyClientFrame | AnyServerFrame:
+def parse_headers(header_lines: Iterable[bytes]) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    for line in header_lines:
+        if header := parse_header(line):
+            headers.setdefault(*header)  # only first header is accepted
+    return headers
+
+
+def parse_content_length(header_lines: Iterable[bytes]) -> int | None:
+    content_length = None
+    seen_keys = set()
+    for line in header_lines:
+        if not ((line[14:15] == COLON_ and line[:14].lower() == b"content-length") or BACKSLASH in line) or not (
+            header := parse_header(line)
+        ):
+            continue
+        header_key, header_value = header
+        if header_key.lower() == "content-length" and header_key not in seen_keys:
+            seen_keys.add(header_key)
+            with suppress(ValueError):
+                if (parsed_value := int(header_value)) >= 0:
+                    content_length = parsed_value
+    return content_length
+
+
+class LazyHeaders(Mapping[str, str]):
+    """Read-only headers that are decoded from raw header lines only when accessed.
+
+    Looking up a single key scans the raw lines for it and remembers the value. Anything that needs all headers
+    (iteration, length, comparison) decodes them once. It's not a dict subclass on purpose: code that reads dicts
+    directly, like `json.dumps()`, would see dict storage that isn't filled yet. Use `dict(headers)` to get a dict.
+    """
+
+    __slots__ = ("_header_lines", "_headers")
+
+    def __init__(self, header_lines: list[bytes]) -> None:
+        self._header_lines: list[bytes] | None = header_lines
+        self._headers: dict[str, str] = {}
+
+    def _decode_all(self) -> dict[str, str]:
+        if self._header_lines is not None:
+            # Values cached by lookups are replaced, so that headers keep their original order
+            self._headers = parse_headers(self._header_lines)
+            self._header_lines = None
+        return self._headers
+
+    def _find(self, key: object) -> str | None:
+        if not isinstance(key, str):
+            return None
+        if (value := self._headers.get(key)) is not None or self._header_lines is None:
+            return value
+        prefix = key.encode() + COLON_
+        for line in self._header_lines:
+            if (line.startswith(prefix) or BACKSLASH in line) and (header := parse_header(line)) and header[0] == key:
+                self._headers[key] = header[1]
+                return header[1]
+        return None
+
+    def __getitem__(self, key: str) -> str:
+        if (value := self._find(key)) is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: str | None = None) -> str | None:  # type: ignore[override]
+        value = self._find(key)
+        return default if value is None else value
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decode_all())
+
+    def __len__(self) -> int:
+        return len(self._decode_all())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyHeaders):
+            return self._decode_all() == other._decode_all()
+        if isinstance(other, Mapping):
+            return self._decode_all() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self._decode_all())
+
+
+def make_frame_from_parts(
+    *, command: bytes, headers: dict[str, str], body: bytes
+) -> AnyClientFrame | AnyRealServerFrame:
     frame_type = COMMANDS_TO_FRAMES[command]
     headers_ = cast("Any", headers)
     return frame_type(headers=headers_, body=body) if frame_type in FRAMES_WITH_BODY else frame_type(headers=headers_)  # type: ignore[call-arg]
 
 
+def _map_spooled_body(spool: IO[bytes]) -> memoryview:
+    spool.flush()
+    with spool:  # mapping stays valid after the file is closed, and the file is deleted once mapping is released
+        return memoryview(mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ))
+
+
 @dataclass(kw_only=True, slots=True, init=False)
 class FrameParser:
-    _current_buf: bytearray
-    _previous_byte: bytes | None
+    """Incremental STOMP frame parser.
+
+    MESSAGE frames for subscriptions in `raw_message_subscription_ids` are yielded as `RawMessageFrame`: their headers
+    are decoded lazily and body is a memoryview of the received chunk. Bodies of such frames that span several chunks
+    and are longer than `raw_message_spool_threshold` are written to a temporary file as they arrive, and body is a
+    memoryview of that file mapped into memory.
+
+    Frames that are bigger than `max_frame_size` bytes, have more than `max_header_bytes` bytes in command and header
+    lines, or have more than `max_headers` headers make parser raise `FrameLimitExceededError`.
+    """
+
+    _raw_message_subscription_ids: Container[str]
+    _raw_message_spool_threshold: int | None
+    _max_frame_size: int
+    _max_header_bytes: int
+    _max_headers: int
+    _max_header_phase_bytes: int
+    _buffer: bytearray
+    _buffer_length: int
+    _spool: IO[bytes] | None
     _headers_processed: bool
     _command: bytes | None
-    _headers: dict[str, str]
+    _header_lines: list[bytes]
+    _headers: dict[str, str] | LazyHeaders
+    _is_raw: bool
     _content_length: int | None
-
-    def __init__(self) -> None:
-        self._previous_byte = None
+    _body_length: int
+    _body: BytesLike | None
+    _frame_size: int
+
+    def __init__(
+        self,
+        *,
+        raw_message_subscription_ids: Container[str] = frozenset(),
+        raw_message_spool_threshold: int | None = None,
+        max_frame_size: int | None = None,
+        max_header_bytes: int | None = None,
+        max_headers: int | None = None,
+    ) -> None:
+        self._raw_message_subscription_ids = raw_message_subscription_ids
+        self._raw_message_spool_threshold = raw_message_spool_threshold
+        # Missing limits are replaced with sys.maxsize so that checks are plain comparisons
+        self._max_frame_size = sys.maxsize if max_frame_size is None else max_frame_size
+        self._max_header_bytes = sys.maxsize if max_header_bytes is None else max_header_bytes
+        self._max_headers = sys.maxsize if max_headers is None else max_headers
+        self._max_header_phase_bytes = min(self._max_frame_size, self._max_header_bytes)
+        self._buffer = bytearray()
+        self._spool = None
+        self._header_lines = []
+        self._headers = {}
         self._reset()
 
     def _reset(self) -> None:
-        self._current_buf = bytearray()
+        self._buffer_length = 0
+        if len(self._buffer) > MAX_RETAINED_BUFFER_SIZE:
+            self._buffer = bytearray()
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
         self._headers_processed = False
         self._command = None
-        self._headers = {}
+        self._header_lines.clear()
+        self._is_raw = False
         self._content_length = None
+        self._body_length = 0
+        self._body = None
+        self._frame_size = 0
 
-    def _handle_null_byte(self) -> Iterator[AnyClientFrame | AnyServerFrame]:
-        if not self._command or not self._headers_processed:
-            self._reset()
-            return
-        if self._content_length is not None and self._content_length != len(self._current_buf):
-            self._current_buf += NULL
-            return
-        yield make_frame_from_parts(command=self._command, headers=self._headers, body=bytes(self._current_buf))
+    def _raise_limit_exceeded(self, limit_name: str, limit: int, value: int) -> NoReturn:
         self._reset()
+        raise FrameLimitExceededError(limit_name=limit_name, limit=limit, value=value)
+
+    def _raise_header_bytes_exceeded(self) -> NoReturn:
+        if self._frame_size > self._max_header_bytes:
+            self._raise_limit_exceeded("max_header_bytes", self._max_header_bytes, self._frame_size)
+        self._raise_limit_exceeded("max_frame_size", self._max_frame_size, self._frame_size)
+
+    def _make_frame(self, body: BytesLike) -> AnyClientFrame | AnyRealServerFrame | RawMessageFrame:
+        command = cast("bytes", self._command)
+        frame = (
+            RawMessageFrame(
+                command=command, headers=cast("MessageHeaders", self._headers), body=cast("memoryview", body)
+            )
+            if self._is_raw
+            else make_frame_from_parts(
+                command=command, headers=cast("dict[str, str]", self._headers), body=cast("bytes", body)
+            )
+        )
+        self._reset()
+        return frame
+
+    def _process_line(self, line: bytes) -> HeartbeatFrame | None:
+        if not line and not self._command:
+            return HeartbeatFrame()
+        if line.endswith(CARRIAGE):
+            line = line[:-1]
+        self._headers_processed = not line  # extra empty line after headers
+
+        if not self._command:
+            self._process_command(line)
+        elif self._headers_processed:
+            self._process_headers()
+        else:
+            self._header_lines.append(line)
+            if len(self._header_lines) > self._max_headers:
+                self._raise_limit_exceeded("max_headers", self._max_headers, len(self._header_lines))
+        return None
 
-    def _handle_newline_byte(self) -> Iterator[HeartbeatFrame]:
-        if not self._current_buf and not self._command:
-            yield HeartbeatFrame()
-            return
-        if self._previous_byte == CARRIAGE:
-            self._current_buf.pop()
-        self._headers_processed = not self._current_buf  # extra empty line after headers
-
-        if self._command:
-            self._process_header()
+    def _process_command(self, line: bytes) -> None:
+        if line in COMMANDS_TO_FRAMES:
+            self._command = line
         else:
-            self._process_command()
+            self._reset()
 
-    def _process_command(self) -> None:
-        current_buf_bytes = bytes(self._current_buf)
-        if current_buf_bytes not in COMMANDS_TO_FRAMES:
+    def _process_headers(self) -> None:
+        self._content_length = parse_content_length(self._header_lines)
+        if (
+            self._command == b"MESSAGE"
+            and self._raw_message_subscription_ids
+            and (lazy_headers := LazyHeaders(self._header_lines)).get("subscription")
+            in self._raw_message_subscription_ids
+        ):
+            # Header lines are kept by lazy headers, so the list can't be reused for the next frame
+            self._is_raw = True
+            self._headers = lazy_headers
+            self._header_lines = []
+        else:
+            self._headers = parse_headers(self._header_lines)
+        if self._content_length is not None and self._frame_size + self._content_length > self._max_frame_size:
+            self._raise_limit_exceeded("max_frame_size", self._max_frame_size, self._frame_size + self._content_length)
+
+    def _slice_body(self, chunk: bytes, view: memoryview, start: int, end: int) -> BytesLike:
+        return view[start:end] if self._is_raw else chunk[start:end]
+
+    def _should_spool(self, body_length: int) -> bool:
+        return (
+            self._is_raw
+            and self._raw_message_spool_threshold is not None
+            and body_length > self._raw_message_spool_threshold
+        )
+
+    def _append_to_buffer(self, part: memoryview) -> None:
+        end = self._buffer_length + len(part)
+        self._buffer[self._buffer_length : end] = part
+        self._buffer_length = end
+
+    def _take_buffered_line(self) -> bytes:
+        line = bytes(self._buffer[: self._buffer_length])
+        self._buffer_length = 0
+        return line
+
+    def _take_buffered_body(self) -> bytes:
+        with memoryview(self._buffer) as buffer_view:
+            body = buffer_view[: self._buffer_length].tobytes()
+        self._buffer_length = 0
+        return body
+
+    def _buffer_body_part(self, part: memoryview) -> None:
+        if self._spool is None and self._should_spool(self._buffer_length + len(part)):
+            self._spool = tempfile.TemporaryFile()  # ruff: ignore[open-file-with-context-handler]
+            with memoryview(self._buffer) as buffer_view:
+                self._spool.write(buffer_view[: self._buffer_length])
+            self._buffer_length = 0
+        if self._spool is None:
+            self._append_to_buffer(part)
+        else:
+            self._spool.write(part)
+
+    def _take_buffer(self) -> BytesLike:
+        if self._spool is not None:
+            spooled_body = _map_spooled_body(self._spool)
+            self._spool = None
+            return spooled_body
+        if not self._is_raw:
+            return self._take_buffered_body()
+        # Raw body is a view of the buffer, so the buffer is given away instead of being copied
+        del self._buffer[self._buffer_length :]
+        body = memoryview(self._buffer).toreadonly()
+        self._buffer = bytearray()
+        self._buffer_length = 0
+        return body
+
+    def _parse_line(self, chunk: bytes, view: memoryview, position: int) -> tuple[int, HeartbeatFrame | None]:
+        newline_index = chunk.find(NEWLINE, position)
+        line_end = len(chunk) if newline_index == -1 else newline_index
+
+        if (null_index := chunk.find(NULL, position, line_end)) != -1:
             self._reset()
+            return null_index + 1, None
+        self._frame_size += line_end - position
+        if self._frame_size > self._max_header_phase_bytes:
+            self._raise_header_bytes_exceeded()
+        if newline_index == -1:
+            self._append_to_buffer(view[position:])
+            return len(chunk), None
+
+        if self._buffer_length:
+            self._append_to_buffer(view[position:newline_index])
+            line = self._take_buffered_line()
         else:
-            self._command = current_buf_bytes
-            self._current_buf = bytearray()
-
-    def _process_header(self) -> None:
-        header = parse_header(self._current_buf)
-        if not header:
-            self._current_buf = bytearray()
-            return
-        header_key, header_value = header
-        if header_key not in self._headers:
-            self._headers[header_key] = header_value
-            if header_key.lower() == "content-length":
-                with suppress(ValueError):
-                    self._content_length = int(header_value)
-        self._current_buf = bytearray()
-
-    def _handle_body_byte(self, byte: bytes) -> None:
-        if self._content_length is None or self._content_length != len(self._current_buf):
-            self._current_buf += byte
-
-    def parse_frames_from_chunk(self, chunk: bytes) -> Iterator[AnyClientFrame | AnyServerFrame]:
-        for byte in iter_bytes(chunk):
-            if byte == NULL:
-                yield from self._handle_null_byte()
-            elif self._headers_processed:
-                self._handle_body_byte(byte)
-            elif byte == NEWLINE:
-                yield from self._handle_newline_byte()
+            line = chunk[position:newline_index]
+        return newline_index + 1, self._process_line(line)
+
+    def _parse_body(
+        self, chunk: bytes, view: memoryview, position: int
+    ) -> tuple[int, AnyClientFrame | AnyRealServerFrame | RawMessageFrame | None]:
+        if self._content_length is not None:
+            return self._parse_body_with_content_length(chunk, view, position, self._content_length)
+
+        null_index = chunk.find(NULL, position)
+        self._frame_size += (len(chunk) if null_index == -1 else null_index) - position
+        if self._frame_size > self._max_frame_size:
+            self._raise_limit_exceeded("max_frame_size", self._max_frame_size, self._frame_size)
+        if null_index == -1:
+            self._buffer_body_part(view[position:])
+            return len(chunk), None
+        if self._buffer_length or self._spool is not None:
+            self._buffer_body_part(view[position:null_index])
+            body = self._take_buffer()
+        else:
+            body = self._slice_body(chunk, view, position, null_index)
+        return null_index + 1, self._make_frame(body)
+
+    def _parse_body_with_content_length(
+        self, chunk: bytes, view: memoryview, position: int, content_length: int
+    ) -> tuple[int, AnyClientFrame | AnyRealServerFrame | RawMessageFrame | None]:
+        if self._body is None:
+            if not self._body_length and len(chunk) - position >= content_length:
+                self._body = self._slice_body(chunk, view, position, position + content_length)
+                position += content_length
             else:
-                self._current_buf += byte
+                # Body spans several chunks: copy each part into its place in a buffer. content-length comes from the
+                # peer, so buffer is allocated for at most one chunk up front and grows as the rest of body arrives
+                if not self._body_length:
+                    if self._should_spool(content_length):
+                        self._spool = tempfile.TemporaryFile()  # ruff: ignore[open-file-with-context-handler]
+                    elif len(self._buffer) < (initial_size := min(content_length, len(chunk))):
+                        self._buffer = bytearray(initial_size)
+                end = min(position + content_length - self._body_length, len(chunk))
+                if self._spool is None:
+                    self._append_to_buffer(view[position:end])
+                else:
+                    self._spool.write(view[position:end])
+                self._body_length += end - position
+                position = end
+                if self._body_length != content_length:
+                    return position, None
+                self._body = self._take_buffer()
+
+        # Bytes between the end of content-length body and the NULL byte are ignored
+        if (null_index := chunk.find(NULL, position)) == -1:
+            return len(chunk), None
+        return null_index + 1, self._make_frame(self._body)
 
-            self._previous_byte = byte
+    def parse_frames_from_chunk(self, chunk: bytes) -> Iterator[AnyClientFrame | AnyServerFrame]:
+        view = memoryview(chunk)
+        position = 0
+        while position < len(chunk):
+            position, frame = (
+                self._parse_body(chunk, view, position)
+                if self._headers_processed
+                else self._parse_line(chunk, view, position)
+            )
+            if frame is not None:
+                yield frame
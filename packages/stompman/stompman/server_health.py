@@ -0,0 +1,141 @@
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Final, Literal
+
+from stompman.config import ConnectionParameters
+
+# Weight of the newest measurement in exponentially weighted moving averages of latencies
+LATENCY_SMOOTHING_FACTOR: Final = 0.3
+
+ServerKey = tuple[str, int]
+CircuitState = Literal["closed", "open", "half-open"]
+
+
+def get_server_key(server: ConnectionParameters) -> ServerKey:
+    return (server.host, server.port)
+
+
+@dataclass(kw_only=True, slots=True)
+class ServerHealth:
+    connect_latency: float | None = None
+    """Smoothed seconds to establish transport connection. None if never connected."""
+    confirmation_latency: float | None = None
+    """Smoothed seconds from CONNECT to CONNECTED frame. None if never confirmed."""
+    consecutive_failures: int = 0
+    """Failed connection attempts and short-lived connections since server was last connected for a while."""
+    error_frames: int = 0
+    """ERROR frames received since server was last connected for a while."""
+    cooldown_until: float = 0
+    """Clock time until which server is not tried if there are other servers."""
+    connected_at: float | None = None
+    """Clock time of CONNECTED frame of current connection. None if not connected."""
+
+    @property
+    def latency(self) -> float:
+        if self.connect_latency is None or self.confirmation_latency is None:
+            return math.inf
+        return self.connect_latency + self.confirmation_latency
+
+    @property
+    def problem_count(self) -> int:
+        return self.consecutive_failures + self.error_frames
+
+
+def _smooth(previous: float | None, value: float) -> float:
+    if previous is None:
+        return value
+    return previous + LATENCY_SMOOTHING_FACTOR * (value - previous)
+
+
+@dataclass(kw_only=True, slots=True)
+class ServerHealthTracker:
+    """Remembers how servers behaved and orders connection attempts: fastest healthy servers first.
+
+    Connection that is lost within `stable_connection_time` seconds counts as a failure, so servers that accept
+    connections and drop them right away are treated as failing. Each server has a circuit breaker: after
+    `cooldown_after_failures` failures in a row it opens, and server isn't tried for `cooldown` seconds, doubled with
+    each further failure up to `max_cooldown`. Then it's half-open: next attempt is a probe, and if it fails, circuit
+    opens again. Circuit closes when probe connects.
+    """
+
+    stable_connection_time: float = 30
+    cooldown_after_failures: int = 3
+    cooldown: float = 1
+    max_cooldown: float = 60
+    clock: Callable[[], float] = time.monotonic
+    _health: dict[ServerKey, ServerHealth] = field(init=False, default_factory=dict)
+
+    def get(self, server: ConnectionParameters) -> ServerHealth:
+        if (health := self._health.get(key := get_server_key(server))) is None:
+            health = self._health[key] = ServerHealth()
+        return health
+
+    def snapshot(self) -> dict[ServerKey, ServerHealth]:
+        """Copy of health of all servers that were tried, by (host, port). For monitoring."""
+        return {
+            key: ServerHealth(
+                connect_latency=health.connect_latency,
+                confirmation_latency=health.confirmation_latency,
+                consecutive_failures=health.consecutive_failures,
+                error_frames=health.error_frames,
+                cooldown_until=health.cooldown_until,
+                connected_at=health.connected_at,
+            )
+            for key, health in self._health.items()
+        }
+
+    def get_circuit_state(self, server: ConnectionParameters) -> CircuitState:
+        health = self.get(server)
+        if health.connected_at is not None or health.consecutive_failures < self.cooldown_after_failures:
+            return "closed"
+        return "open" if health.cooldown_until > self.clock() else "half-open"
+
+    def order(self, servers: list[ConnectionParameters]) -> list[ConnectionParameters]:
+        """Servers without problems by latency, then servers with problems, then half-open ones to probe.
+
+        Servers that were never connected to keep their order from `servers` and go after known healthy ones. Servers
+        with open circuit are left out. If all circuits are open, only the one that is going to be half-open first is
+        returned, so there's always a server to probe, but not the whole list.
+        """
+        circuit_states = {get_server_key(server): self.get_circuit_state(server) for server in servers}
+        if available_servers := [server for server in servers if circuit_states[get_server_key(server)] != "open"]:
+            return sorted(
+                available_servers,
+                key=lambda server: (
+                    circuit_states[get_server_key(server)] == "half-open",
+                    self.get(server).problem_count > 0,
+                    self.get(server).latency,
+                ),
+            )
+        return [min(servers, key=lambda server: self.get(server).cooldown_until)] if servers else []
+
+    def record_connect(self, server: ConnectionParameters, latency: float) -> None:
+        health = self.get(server)
+        health.connect_latency = _smooth(health.connect_latency, latency)
+
+    def record_confirmation(self, server: ConnectionParameters, latency: float) -> None:
+        health = self.get(server)
+        health.confirmation_latency = _smooth(health.confirmation_latency, latency)
+        health.connected_at = self.clock()
+        health.cooldown_until = 0
+
+    def record_connection_lost(self, server: ConnectionParameters) -> None:
+        health = self.get(server)
+        connected_at, health.connected_at = health.connected_at, None
+        if connected_at is not None and self.clock() - connected_at >= self.stable_connection_time:
+            health.consecutive_failures = 0
+            health.error_frames = 0
+            health.cooldown_until = 0
+        else:
+            self.record_failure(server)
+
+    def record_failure(self, server: ConnectionParameters) -> None:
+        health = self.get(server)
+        health.consecutive_failures += 1
+        if (extra_failures := health.consecutive_failures - self.cooldown_after_failures) >= 0:
+            health.cooldown_until = self.clock() + min(self.cooldown * 2**extra_failures, self.max_cooldown)
+
+    def record_error_frame(self, server: ConnectionParameters) -> None:
+        self.get(server).error_frames += 1
@@ -11,15 +11,18 @@ from stompman.frames import (
     AckMode,
     MessageFrame,
     NackFrame,
+    RawMessageFrame,
     SubscribeFrame,
     UnsubscribeFrame,
 )
 from stompman.logger import LOGGER
+from stompman.serde import dump_ack_frame, dump_ack_frame_suffix
 
 
 @dataclass(kw_only=True, slots=True, frozen=True)
 class ActiveSubscriptions:
     subscriptions: dict[str, "AutoAckSubscription | ManualAckSubscription"] = field(default_factory=dict, init=False)
+    raw_subscription_ids: set[str] = field(default_factory=set, init=False)
     event: asyncio.Event = field(default_factory=asyncio.Event, init=False)
 
     def __post_init__(self) -> None:
@@ -37,11 +40,14 @@ class ActiveSubscriptions:
     def delete_by_id(self, subscription_id: str) -> None:
         if subscription_id in self.subscriptions:
             del self.subscriptions[subscription_id]
+        self.raw_subscription_ids.discard(subscription_id)
         if not self.subscriptions:
             self.event.set()
 
     def add(self, subscription: "AutoAckSubscription | ManualAckSubscription") -> None:
         self.subscriptions[subscription.id] = subscription
+        if subscription.raw:
+            self.raw_subscription_ids.add(subscription.id)
         self.event.clear()
 
     def contains_by_id(self, subscription_id: str) -> bool:
@@ -57,10 +63,13 @@ class BaseSubscription:
     destination: str
     headers: dict[str, str] | None
     ack: AckMode
+    raw: bool = False
     _connection_manager: ConnectionManager
     _active_subscriptions: ActiveSubscriptions
+    _ack_frame_suffix: bytes = field(init=False, repr=False, default=b"")
 
     async def _subscribe(self) -> None:
+        self._ack_frame_suffix = dump_ack_frame_suffix(self.id)
         await self._connection_manager.write_frame_reconnecting(
             SubscribeFrame.build(
                 subscription_id=self.id, destination=self.destination, ack=self.ack, headers=self.headers
@@ -72,7 +81,7 @@ class BaseSubscription:
         self._active_subscriptions.delete_by_id(self.id)
         await self._connection_manager.maybe_write_frame(UnsubscribeFrame(headers={"id": self.id}))
 
-    async def _nack(self, frame: MessageFrame, *, received_at_reconnection_count: int) -> None:
+    async def _nack(self, frame: MessageFrame | RawMessageFrame, *, received_at_reconnection_count: int) -> None:
         if not self._active_subscriptions.contains_by_id(self.id):
             LOGGER.warning(
                 "failed to nack message frame: subscription is not active. "
@@ -102,9 +111,14 @@ class BaseSubscription:
                 self._connection_manager._reconnection_count,
             )
             return
-        await self._connection_manager.maybe_write_frame(NackFrame(headers={"id": ack_id, "subscription": self.id}))
+        await self._connection_manager.maybe_write_ack_frame(
+            NackFrame,
+            ack_id=ack_id,
+            subscription_id=self.id,
+            parts=[dump_ack_frame(NackFrame, ack_id=ack_id, suffix=self._ack_frame_suffix)],
+        )
 
-    async def _ack(self, frame: MessageFrame, *, received_at_reconnection_count: int) -> None:
+    async def _ack(self, frame: MessageFrame | RawMessageFrame, *, received_at_reconnection_count: int) -> None:
         if not self._active_subscriptions.contains_by_id(self.id):
             LOGGER.warning(
                 "failed to ack message frame: subscription is not active. "
@@ -134,20 +148,25 @@ class BaseSubscription:
                 self._connection_manager._reconnection_count,
             )
             return
-        await self._connection_manager.maybe_write_frame(AckFrame(headers={"id": ack_id, "subscription": self.id}))
+        await self._connection_manager.maybe_write_ack_frame(
+            AckFrame,
+            ack_id=ack_id,
+            subscription_id=self.id,
+            parts=[dump_ack_frame(AckFrame, ack_id=ack_id, suffix=self._ack_frame_suffix)],
+        )
 
 
 @dataclass(kw_only=True, slots=True)
 class AutoAckSubscription(BaseSubscription):
-    handler: Callable[[MessageFrame], Awaitable[Any]]
-    on_suppressed_exception: Callable[[Exception, MessageFrame], Any]
+    handler: Callable[[MessageFrame | RawMessageFrame], Awaitable[Any]]
+    on_suppressed_exception: Callable[[Exception, MessageFrame | RawMessageFrame], Any]
     suppressed_exception_classes: tuple[type[Exception], ...]
     _should_handle_ack_nack: bool = field(init=False)
 
     def __post_init__(self) -> None:
         self._should_handle_ack_nack = self.ack in {"client", "client-individual"}
 
-    async def _run_handler(self, *, frame: MessageFrame, received_at_reconnection_count: int) -> None:
+    async def _run_handler(self, *, frame: MessageFrame | RawMessageFrame, received_at_reconnection_count: int) -> None:
         try:
             await self.handler(frame)
         except self.suppressed_exception_classes as exception:
@@ -161,7 +180,7 @@ class AutoAckSubscription(BaseSubscription):
 
 @dataclass(kw_only=True, slots=True)
 class ManualAckSubscription(BaseSubscription):
-    handler: Callable[["AckableMessageFrame"], Coroutine[Any, Any, Any]]
+    handler: Callable[["AckableMessageFrame | AckableRawMessageFrame"], Coroutine[Any, Any, Any]]
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -176,6 +195,18 @@ class AckableMessageFrame(MessageFrame):
         await self._subscription._nack(self, received_at_reconnection_count=self._received_at_reconnection_count)
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class AckableRawMessageFrame(RawMessageFrame):
+    _subscription: ManualAckSubscription
+    _received_at_reconnection_count: int
+
+    async def ack(self) -> None:
+        await self._subscription._ack(self, received_at_reconnection_count=self._received_at_reconnection_count)
+
+    async def nack(self) -> None:
+        await self._subscription._nack(self, received_at_reconnection_count=self._received_at_reconnection_count)
+
+
 def _make_subscription_id() -> str:
     return str(uuid4())
 
@@ -5,7 +5,7 @@ from uuid import uuid4
 
 from stompman.connection import AbstractConnection
 from stompman.connection_manager import ConnectionManager
-from stompman.frames import AbortFrame, BeginFrame, CommitFrame, SendFrame
+from stompman.frames import AbortFrame, BeginFrame, BytesLike, CommitFrame, SendFrame
 
 ActiveTransactions = set["Transaction"]
 
@@ -35,7 +35,7 @@ class Transaction:
 
     async def send(
         self,
-        body: bytes,
+        body: BytesLike,
         destination: str,
         *,
         content_type: str | None = None,
@@ -51,6 +51,8 @@ class Transaction:
             headers=headers,
         )
         self.sent_frames.append(frame)
+        # Not put to outbox: sent frames are written again with COMMIT after reconnecting. Broker delivers them on
+        # commit, so their order relative to SEND frames outside of transaction is decided by the time of commit anyway
         await self._connection_manager.write_frame_reconnecting(frame)
 
 
@@ -98,6 +98,9 @@ class EnrichedConnectionManager(ConnectionManager):
 DataclassType = TypeVar("DataclassType")
 
 
+DataclassFactory.add_provider(memoryview, lambda: memoryview(b"body"))
+
+
 def build_dataclass(dataclass: type[DataclassType], **kwargs: Any) -> DataclassType:  # ruff: ignore[any-type]
     return DataclassFactory.create_factory(dataclass).build(**kwargs)
 
@@ -1,3 +1,4 @@
+import socket
 from typing import TypedDict
 
 import faker
@@ -106,3 +107,34 @@ class TestConnectionParametersFromPydanticMultiHostHosts:
 
         with pytest.raises(ValueError, match="all username-password pairs or only one pair must be set"):
             stompman.ConnectionParameters.from_pydantic_multihost_hosts(hosts)
+
+
+def test_socket_options_apply() -> None:
+    options = stompman.SocketOptions(
+        tcp_nodelay=True,
+        receive_buffer_size=256 * 1024,
+        send_buffer_size=256 * 1024,
+        keepalive_idle=5,
+        keepalive_interval=2,
+        keepalive_probes=4,
+    )
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        options.apply(sock)
+
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 256 * 1024
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) >= 256 * 1024
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == options.keepalive_idle
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL) == options.keepalive_interval
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT) == options.keepalive_probes
+
+
+def test_socket_options_apply_disabled() -> None:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        stompman.SocketOptions(tcp_nodelay=False, keepalive=False).apply(sock)
+
+        assert not sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert not sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
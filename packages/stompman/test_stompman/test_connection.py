@@ -1,6 +1,8 @@
 import asyncio
 import socket
 from collections.abc import Awaitable
+from datetime import timedelta
+from functools import partial
 from typing import Any
 from unittest import mock
 
@@ -11,7 +13,10 @@ from stompman import (
     CommitFrame,
     ConnectedFrame,
     ConnectionLostError,
+    FrameLimitExceededError,
+    FrameParser,
     HeartbeatFrame,
+    SendFrame,
 )
 from stompman.connection import Connection
 from stompman.serde import NEWLINE
@@ -43,6 +48,7 @@ async def test_connection_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
         close = mock.Mock()
         wait_closed = mock.AsyncMock()
         write = mock.Mock()
+        writelines = mock.Mock()
         drain = mock.AsyncMock()
 
     read_bytes = [
@@ -72,6 +78,7 @@ async def test_connection_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
         HeartbeatFrame(),
         ConnectedFrame(headers={"heart-beat": "0,0", "version": "1.2", "server": "some server"}),
     ]
+    body = memoryview(bytearray(b"large body"))
 
     class MockReader:
         read = mock.AsyncMock(side_effect=read_bytes)
@@ -79,6 +86,7 @@ async def test_connection_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
     connection = await make_mocked_connection(monkeypatch, MockReader(), MockWriter())
     connection.write_heartbeat()
     await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
+    await connection.write_frame(SendFrame(headers={"destination": "queue"}, body=body))
 
     async def take_frames(count: int) -> list[AnyServerFrame]:
         frames = []
@@ -94,9 +102,14 @@ async def test_connection_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
 
     MockWriter.close.assert_called_once_with()
     MockWriter.wait_closed.assert_called_once_with()
-    MockWriter.drain.assert_called_once_with()
+    assert MockWriter.drain.mock_calls == [mock.call(), mock.call()]
     assert MockReader.read.mock_calls == [mock.call(connection.read_max_chunk_size)] * len(read_bytes)
-    assert MockWriter.write.mock_calls == [mock.call(NEWLINE), mock.call(b"COMMIT\ntransaction:transaction\n\n\x00")]
+    assert MockWriter.write.mock_calls == [mock.call(NEWLINE)]
+    assert MockWriter.writelines.mock_calls == [
+        mock.call([b"COMMIT\ntransaction:transaction\n\n\x00"]),
+        mock.call([b"SEND\ndestination:queue\n\n", body, b"\x00"]),
+    ]
+    assert MockWriter.writelines.mock_calls[1].args[0][1] is body
 
 
 async def test_connection_close_connection_error(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -119,7 +132,7 @@ async def test_connection_write_heartbeat_runtime_error(monkeypatch: pytest.Monk
 
 async def test_connection_write_frame_connection_error(monkeypatch: pytest.MonkeyPatch) -> None:
     class MockWriter:
-        write = mock.Mock()
+        writelines = mock.Mock()
         drain = mock.AsyncMock(side_effect=ConnectionError)
 
     connection = await make_mocked_connection(monkeypatch, mock.Mock(), MockWriter())
@@ -129,7 +142,7 @@ async def test_connection_write_frame_connection_error(monkeypatch: pytest.Monke
 
 async def test_connection_write_frame_runtime_error(monkeypatch: pytest.MonkeyPatch) -> None:
     class MockWriter:
-        write = mock.Mock(side_effect=RuntimeError)
+        writelines = mock.Mock(side_effect=RuntimeError)
         drain = mock.AsyncMock()
 
     connection = await make_mocked_connection(monkeypatch, mock.Mock(), MockWriter())
@@ -137,6 +150,100 @@ async def test_connection_write_frame_runtime_error(monkeypatch: pytest.MonkeyPa
         await connection.write_frame(BeginFrame(headers={"transaction": ""}))
 
 
+@pytest.mark.parametrize("window", [timedelta(), timedelta(microseconds=100)])
+async def test_connection_write_coalescing(monkeypatch: pytest.MonkeyPatch, window: timedelta) -> None:
+    class MockWriter:
+        writelines = mock.Mock()
+        drain = mock.AsyncMock()
+
+    connection = await make_mocked_connection(monkeypatch, mock.Mock(), MockWriter())
+    connection.write_coalescing_window = window
+    body = b"body"
+
+    await asyncio.gather(
+        connection.write_frame(BeginFrame(headers={"transaction": "transaction"})),
+        connection.write_frame(SendFrame(headers={"destination": "queue"}, body=body)),
+        connection.write_frame_parts([b"ACK\nid:1\nsubscription:1\n\n\x00"]),
+    )
+    await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
+
+    assert MockWriter.writelines.mock_calls == [
+        mock.call(
+            [
+                b"BEGIN\ntransaction:transaction\n\n\x00",
+                b"SEND\ndestination:queue\n\n",
+                body,
+                b"\x00",
+                b"ACK\nid:1\nsubscription:1\n\n\x00",
+            ]
+        ),
+        mock.call([b"COMMIT\ntransaction:transaction\n\n\x00"]),
+    ]
+    assert MockWriter.drain.mock_calls == [mock.call(), mock.call()]
+
+
+async def test_connection_write_coalescing_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    class MockWriter:
+        writelines = mock.Mock()
+        drain = mock.AsyncMock(side_effect=ConnectionError)
+
+    connection = await make_mocked_connection(monkeypatch, mock.Mock(), MockWriter())
+    connection.write_coalescing_window = timedelta()
+
+    results = await asyncio.gather(
+        *(connection.write_frame(BeginFrame(headers={"transaction": str(index)})) for index in range(3)),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [ConnectionLostError] * 3
+    assert MockWriter.drain.mock_calls == [mock.call()]
+
+
+async def test_connection_close_cancels_pending_flush(monkeypatch: pytest.MonkeyPatch) -> None:
+    class MockWriter:
+        writelines = mock.Mock()
+        drain = mock.AsyncMock()
+        close = mock.Mock()
+        wait_closed = mock.AsyncMock()
+
+    connection = await make_mocked_connection(monkeypatch, mock.Mock(), MockWriter())
+    connection.write_coalescing_window = timedelta(seconds=10)
+    write_task = asyncio.create_task(connection.write_frame(BeginFrame(headers={"transaction": "transaction"})))
+    await asyncio.sleep(0)
+
+    await connection.close()
+
+    with pytest.raises(ConnectionLostError):
+        await write_task
+    MockWriter.writelines.assert_not_called()
+
+
+async def test_connection_outbound_scheduler(monkeypatch: pytest.MonkeyPatch) -> None:
+    class MockWriter:
+        close = mock.Mock()
+        wait_closed = mock.AsyncMock()
+        writelines = mock.Mock()
+        drain = mock.AsyncMock()
+
+    connection = await make_mocked_connection(monkeypatch, mock.Mock(), MockWriter())
+    connection.max_queued_send_frames = 1
+
+    await asyncio.gather(
+        connection.write_frame(SendFrame(headers={"destination": "queue"}, body=b"body")),
+        connection.write_frame(CommitFrame(headers={"transaction": "transaction"})),
+    )
+    connection.write_heartbeat()
+    await asyncio.sleep(0)
+    await connection.close()
+
+    assert MockWriter.writelines.mock_calls == [
+        mock.call([b"COMMIT\ntransaction:transaction\n\n\x00", b"SEND\ndestination:queue\n\n", b"body", b"\x00"]),
+        mock.call([NEWLINE]),
+    ]
+    with pytest.raises(ConnectionLostError):
+        await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
+
+
 async def test_connection_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
     mock_wait_for(monkeypatch)
     assert not await make_connection()
@@ -154,3 +261,29 @@ async def test_read_frames_connection_error(monkeypatch: pytest.MonkeyPatch) ->
     )
     with pytest.raises(ConnectionLostError):
         [frame async for frame in connection.read_frames()]
+
+
+async def test_read_frames_frame_limit_exceeded(monkeypatch: pytest.MonkeyPatch) -> None:
+    connection = await make_mocked_connection(
+        monkeypatch, mock.AsyncMock(read=mock.AsyncMock(return_value=b"MESSAGE\n" + b"a" * 100)), mock.AsyncMock()
+    )
+    connection.frame_parser_factory = partial(FrameParser, max_header_bytes=64)
+
+    with pytest.raises(ConnectionLostError) as exc_info:
+        [frame async for frame in connection.read_frames()]
+
+    assert exc_info.value.reason == FrameLimitExceededError(limit_name="max_header_bytes", limit=64, value=107)
+
+
+async def test_read_frames_yields_frames_before_frame_limit_exceeded(monkeypatch: pytest.MonkeyPatch) -> None:
+    connection = await make_mocked_connection(
+        monkeypatch,
+        mock.AsyncMock(read=mock.AsyncMock(return_value=b"\nMESSAGE\n" + b"a" * 100)),
+        mock.AsyncMock(),
+    )
+    connection.frame_parser_factory = partial(FrameParser, max_header_bytes=64)
+    read_frames = connection.read_frames()
+
+    assert await anext(read_frames) == HeartbeatFrame()
+    with pytest.raises(ConnectionLostError):
+        await anext(read_frames)
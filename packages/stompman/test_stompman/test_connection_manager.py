@@ -2,6 +2,7 @@ import asyncio
 import logging
 import time
 from collections.abc import AsyncGenerator, AsyncIterable
+from contextlib import suppress
 from datetime import timedelta
 from ssl import SSLContext
 from typing import Literal, Self
@@ -20,13 +21,16 @@ from stompman import (
     FailedAllWriteAttemptsError,
     Heartbeat,
     MessageFrame,
+    SendFrame,
 )
 from stompman.connection_lifespan import EstablishedConnectionResult
 from stompman.connection_manager import ActiveConnectionState
+from stompman.frames import AnyClientFrame, BytesLike
 
 from test_stompman.conftest import (
     BaseMockConnection,
     EnrichedConnectionManager,
+    SomeError,
     build_dataclass,
 )
 
@@ -73,6 +77,23 @@ async def test_connect_attempts_ok(ok_on_attempt: int, monkeypatch: pytest.Monke
     assert attempts == ok_on_attempt == (len(sleep_mock.mock_calls) + 1)
 
 
+async def test_connect_attempts_wait_for_retry_policy(monkeypatch: pytest.MonkeyPatch) -> None:
+    class MockConnection(BaseMockConnection):
+        connect = mock.AsyncMock(return_value=None)
+
+    sleep_mock = mock.AsyncMock()
+    monkeypatch.setattr("asyncio.sleep", sleep_mock)
+    manager = EnrichedConnectionManager(
+        connection_class=MockConnection,
+        retry_policy=stompman.ExponentialBackoff(base_delay=2, max_delay=5, jitter=False),
+    )
+
+    with pytest.raises(FailedAllConnectAttemptsError):
+        await manager._get_active_connection_state()
+
+    assert sleep_mock.mock_calls == [mock.call(2), mock.call(4), mock.call(5)]
+
+
 async def test_connect_to_one_server_fails() -> None:
     class MockConnection(BaseMockConnection):
         connect = mock.AsyncMock(return_value=None)
@@ -137,6 +158,232 @@ async def test_connect_to_any_server_fails() -> None:
     assert not await manager._create_connection_to_any_server()
 
 
+async def test_connect_to_any_server_staggers_and_cancels_pending_attempts() -> None:
+    started_ports: list[int] = []
+    cancelled_ports: list[int] = []
+
+    class MockConnection(BaseMockConnection):
+        @classmethod
+        async def connect(
+            cls,
+            *,
+            host: str,
+            port: int,
+            timeout: int,
+            read_max_chunk_size: int,
+            ssl: Literal[True] | SSLContext | None,
+            ws_uri_path: str | None = None,
+        ) -> Self | None:
+            started_ports.append(port)
+            if port == fast_server.port:
+                return cls()
+            try:
+                await asyncio.Future()
+            except asyncio.CancelledError:
+                cancelled_ports.append(port)
+                raise
+            return None  # pragma: no cover
+
+    slow_server, fast_server, not_started_server = (
+        ConnectionParameters("localhost", port, "login", "passcode") for port in (1, 2, 3)
+    )
+    manager = EnrichedConnectionManager(
+        servers=[slow_server, fast_server, not_started_server],
+        connection_class=MockConnection,
+        connect_stagger_delay=timedelta(milliseconds=1),
+    )
+
+    connection_and_server = await manager._create_connection_to_any_server()
+
+    assert connection_and_server
+    assert connection_and_server[1] == fast_server
+    assert started_ports == [slow_server.port, fast_server.port]
+    assert cancelled_ports == [slow_server.port]
+
+
+async def test_connect_to_any_server_starts_next_attempt_after_failure() -> None:
+    class MockConnection(BaseMockConnection):
+        @classmethod
+        async def connect(
+            cls,
+            *,
+            host: str,
+            port: int,
+            timeout: int,
+            read_max_chunk_size: int,
+            ssl: Literal[True] | SSLContext | None,
+            ws_uri_path: str | None = None,
+        ) -> Self | None:
+            return cls() if port == successful_server.port else None
+
+    failing_server, successful_server = (
+        ConnectionParameters("localhost", port, "login", "passcode") for port in (1, 2)
+    )
+    manager = EnrichedConnectionManager(
+        servers=[failing_server, successful_server],
+        connection_class=MockConnection,
+        connect_stagger_delay=timedelta(hours=1),
+    )
+
+    connection_and_server = await asyncio.wait_for(manager._create_connection_to_any_server(), timeout=1)
+
+    assert connection_and_server
+    assert connection_and_server[1] == successful_server
+
+
+async def test_connect_to_any_server_tries_healthiest_server_first() -> None:
+    tried_ports = []
+
+    class MockConnection(BaseMockConnection):
+        @classmethod
+        async def connect(
+            cls,
+            *,
+            host: str,
+            port: int,
+            timeout: int,
+            read_max_chunk_size: int,
+            ssl: Literal[True] | SSLContext | None,
+            ws_uri_path: str | None = None,
+        ) -> Self | None:
+            tried_ports.append(port)
+            return cls()
+
+    failed_server, healthy_server = (ConnectionParameters("localhost", port, "login", "passcode") for port in (1, 2))
+    manager = EnrichedConnectionManager(servers=[failed_server, healthy_server], connection_class=MockConnection)
+    manager.server_health.record_failure(failed_server)
+
+    connection_and_server = await manager._create_connection_to_any_server()
+
+    assert connection_and_server
+    assert connection_and_server[1] == healthy_server
+    assert tried_ports == [healthy_server.port]
+
+
+async def test_connect_to_any_server_closes_losing_connections() -> None:
+    all_connected = asyncio.Event()
+    closed_connections: list[BaseMockConnection] = []
+
+    class MockConnection(BaseMockConnection):
+        @classmethod
+        async def connect(
+            cls,
+            *,
+            host: str,
+            port: int,
+            timeout: int,
+            read_max_chunk_size: int,
+            ssl: Literal[True] | SSLContext | None,
+            ws_uri_path: str | None = None,
+        ) -> Self | None:
+            await all_connected.wait()
+            return cls()
+
+        async def close(self) -> None:
+            closed_connections.append(self)
+
+    manager = EnrichedConnectionManager(
+        servers=[ConnectionParameters("localhost", port, "login", "passcode") for port in (1, 2, 3)],
+        connection_class=MockConnection,
+        connect_stagger_delay=timedelta(),
+    )
+    connect_task = asyncio.create_task(manager._create_connection_to_any_server())
+    for _ in range(5):
+        await asyncio.sleep(0)
+    all_connected.set()
+    connection_and_server = await connect_task
+
+    assert connection_and_server
+    assert len(closed_connections) == len(manager.servers) - 1
+    assert all(connection is not connection_and_server[0] for connection in closed_connections)
+
+
+async def test_connect_to_any_server_closes_connection_established_while_cancelling() -> None:
+    closed_ports: list[int] = []
+
+    class MockConnection(BaseMockConnection):
+        port: int = 0
+
+        @classmethod
+        async def connect(
+            cls,
+            *,
+            host: str,
+            port: int,
+            timeout: int,
+            read_max_chunk_size: int,
+            ssl: Literal[True] | SSLContext | None,
+            ws_uri_path: str | None = None,
+        ) -> Self | None:
+            connection = cls()
+            connection.port = port
+            if port == cancelled_server.port:
+                with suppress(asyncio.CancelledError):
+                    await asyncio.Future()
+            return connection
+
+        async def close(self) -> None:
+            closed_ports.append(self.port)
+
+    cancelled_server, successful_server = (
+        ConnectionParameters("localhost", port, "login", "passcode") for port in (1, 2)
+    )
+    manager = EnrichedConnectionManager(
+        servers=[cancelled_server, successful_server],
+        connection_class=MockConnection,
+        connect_stagger_delay=timedelta(),
+    )
+    connection_and_server = await manager._create_connection_to_any_server()
+
+    assert connection_and_server
+    assert connection_and_server[1] == successful_server
+    assert closed_ports == [cancelled_server.port]
+
+
+async def test_connect_to_any_server_closes_established_connections_when_attempt_raises() -> None:
+    closed_ports: list[int] = []
+    other_attempt_finished = asyncio.Event()
+
+    class MockConnection(BaseMockConnection):
+        port: int = 0
+
+        @classmethod
+        async def connect(
+            cls,
+            *,
+            host: str,
+            port: int,
+            timeout: int,
+            read_max_chunk_size: int,
+            ssl: Literal[True] | SSLContext | None,
+            ws_uri_path: str | None = None,
+        ) -> Self | None:
+            if port == failing_server.port:
+                await other_attempt_finished.wait()
+                raise SomeError
+            other_attempt_finished.set()
+            connection = cls()
+            connection.port = port
+            return connection
+
+        async def close(self) -> None:
+            closed_ports.append(self.port)
+
+    failing_server, successful_server = (
+        ConnectionParameters("localhost", port, "login", "passcode") for port in (1, 2)
+    )
+    manager = EnrichedConnectionManager(
+        servers=[failing_server, successful_server],
+        connection_class=MockConnection,
+        connect_stagger_delay=timedelta(),
+    )
+
+    with pytest.raises(SomeError):
+        await manager._create_connection_to_any_server()
+
+    assert closed_ports == [successful_server.port]
+
+
 async def test_get_active_connection_state_lifespan_flaky_ok() -> None:
     enter = mock.AsyncMock(
         side_effect=[build_dataclass(ConnectionLostError), build_dataclass(EstablishedConnectionResult)]
@@ -183,6 +430,23 @@ async def test_get_active_connection_state_lifespan_flaky_fails() -> None:
     assert connection_close.await_count == manager.connect_retry_attempts
 
 
+async def test_get_active_connection_state_records_server_health() -> None:
+    enter = mock.AsyncMock(
+        side_effect=[build_dataclass(ConnectionLostError), build_dataclass(EstablishedConnectionResult)]
+    )
+    manager = EnrichedConnectionManager(
+        lifespan_factory=mock.Mock(return_value=mock.Mock(enter=enter)), connection_class=BaseMockConnection
+    )
+
+    await manager._get_active_connection_state()
+
+    health = manager.server_health.get(manager.servers[0])
+    assert health.consecutive_failures == 1
+    assert health.connect_latency is not None
+    assert health.confirmation_latency is not None
+    assert health.connected_at is not None
+
+
 async def test_get_active_connection_state_fails_to_connect() -> None:
     class MockConnection(BaseMockConnection):
         connect = mock.AsyncMock(return_value=None)
@@ -191,6 +455,48 @@ async def test_get_active_connection_state_fails_to_connect() -> None:
         await EnrichedConnectionManager(connection_class=MockConnection)._get_active_connection_state()
 
 
+async def test_get_active_connection_state_applies_socket_options() -> None:
+    socket_options = stompman.SocketOptions(tcp_nodelay=False, receive_buffer_size=1024)
+    applied_options = []
+
+    class MockConnection(BaseMockConnection):
+        def apply_socket_options(self, options: stompman.SocketOptions) -> None:
+            applied_options.append(options)
+
+    manager = EnrichedConnectionManager(
+        servers=[ConnectionParameters("localhost", 12345, "login", "passcode", socket_options=socket_options)],
+        lifespan_factory=mock.Mock(
+            return_value=mock.Mock(
+                enter=mock.AsyncMock(
+                    return_value=EstablishedConnectionResult(server_heartbeat=build_dataclass(Heartbeat))
+                )
+            )
+        ),
+        connection_class=MockConnection,
+    )
+    await manager._get_active_connection_state()
+
+    assert applied_options == [socket_options]
+
+
+async def test_create_connection_to_one_server_socket_options_fail() -> None:
+    closed_connections = []
+
+    class MockConnection(BaseMockConnection):
+        def apply_socket_options(self, options: stompman.SocketOptions) -> None:
+            raise OSError
+
+        async def close(self) -> None:
+            closed_connections.append(self)
+
+    server = ConnectionParameters("localhost", 12345, "login", "passcode")
+    manager = EnrichedConnectionManager(servers=[server], connection_class=MockConnection)
+
+    assert await manager._create_connection_to_one_server(server) is None
+    assert len(closed_connections) == 1
+    assert manager.server_health.get(server).consecutive_failures == 1
+
+
 async def test_get_active_connection_state_ok_concurrent() -> None:
     server_heartbeat = build_dataclass(Heartbeat)
     enter = mock.AsyncMock(return_value=EstablishedConnectionResult(server_heartbeat=server_heartbeat))
@@ -478,6 +784,134 @@ async def test_read_frames_reconnecting_closes_failed_connection() -> None:
     connection_close.assert_awaited_once_with()
 
 
+async def test_read_frames_reconnecting_records_error_frames_and_lost_connections() -> None:
+    read_attempts = 0
+
+    class MockConnection(BaseMockConnection):
+        @staticmethod
+        async def read_frames() -> AsyncGenerator[AnyServerFrame, None]:
+            nonlocal read_attempts
+            read_attempts += 1
+            yield build_dataclass(ErrorFrame)
+            if read_attempts == 1:
+                raise build_dataclass(ConnectionLostError)
+
+    manager = EnrichedConnectionManager(connection_class=MockConnection)
+    frames = manager.read_frames_reconnecting()
+
+    await anext(frames)
+    await anext(frames)
+
+    health = manager.server_health.get(manager.servers[0])
+    assert (health.error_frames, health.consecutive_failures) == (2, 1)
+
+
+def create_collecting_connection() -> tuple[type[BaseMockConnection], list[AnyClientFrame]]:
+    written_frames: list[AnyClientFrame] = []
+
+    class MockConnection(BaseMockConnection):
+        @staticmethod
+        async def write_frame(frame: AnyClientFrame) -> None:
+            written_frames.append(frame)
+
+    return MockConnection, written_frames
+
+
+def make_send_frame(body: bytes) -> SendFrame:
+    return SendFrame(headers={"destination": "queue"}, body=body)
+
+
+async def test_send_frame_parts_writes_parts() -> None:
+    written_parts = []
+
+    class MockConnection(BaseMockConnection):
+        @staticmethod
+        async def write_frame_parts(parts: list[BytesLike]) -> None:
+            written_parts.append(parts)
+
+    build_frame = mock.Mock()
+    async with EnrichedConnectionManager(connection_class=MockConnection) as manager:
+        written = await manager.send_frame_parts([b"frame"], build_frame)
+
+    assert written.done()
+    assert written_parts == [[b"frame"]]
+    build_frame.assert_not_called()
+
+
+async def test_send_frame_parts_without_write_frame_parts_writes_built_frame() -> None:
+    connection_class, written_frames = create_collecting_connection()
+    frame = make_send_frame(b"body")
+
+    async with EnrichedConnectionManager(connection_class=connection_class) as manager:
+        await manager.send_frame_parts([b"frame"], lambda: frame)
+
+    assert written_frames == [frame]
+
+
+async def test_send_frame_with_outbox_writes_right_away_when_connected() -> None:
+    connection_class, written_frames = create_collecting_connection()
+    frame = make_send_frame(b"body")
+
+    async with EnrichedConnectionManager(connection_class=connection_class, outbox=stompman.Outbox()) as manager:
+        written = await manager.send_frame(frame)
+
+    assert written.done()
+    assert written_frames == [frame]
+    assert manager.outbox is not None
+    assert not manager.outbox
+
+
+async def test_send_frame_with_outbox_flushes_in_order_after_reconnect() -> None:
+    connection_class, written_frames = create_collecting_connection()
+    first_frame, second_frame = make_send_frame(b"first"), make_send_frame(b"second")
+
+    async with EnrichedConnectionManager(connection_class=connection_class, outbox=stompman.Outbox()) as manager:
+        assert manager._active_connection_state
+        await manager._discard_failed_connection_state(
+            manager._active_connection_state, build_dataclass(ConnectionLostError)
+        )
+        first_written = await manager.send_frame(first_frame)
+        second_written = await manager.send_frame_parts([b"second"], lambda: second_frame)
+        assert not written_frames
+
+        await manager._get_active_connection_state()
+        await asyncio.gather(first_written, second_written)
+
+    assert written_frames == [first_frame, second_frame]
+
+
+async def test_send_frame_with_outbox_fails_handles_when_reconnect_fails() -> None:
+    connection_class, _ = create_collecting_connection()
+
+    async with EnrichedConnectionManager(connection_class=connection_class, outbox=stompman.Outbox()) as manager:
+        assert manager._active_connection_state
+        await manager._discard_failed_connection_state(
+            manager._active_connection_state, build_dataclass(ConnectionLostError)
+        )
+        written = await manager.send_frame(make_send_frame(b"body"))
+        connection_class.connect = mock.AsyncMock(return_value=None)  # type: ignore[method-assign]
+
+        with pytest.raises(FailedAllConnectAttemptsError):
+            await manager._get_active_connection_state()
+
+        with pytest.raises(FailedAllConnectAttemptsError):
+            await written
+
+
+async def test_outbox_is_dropped_on_exit() -> None:
+    connection_class, _ = create_collecting_connection()
+
+    async with EnrichedConnectionManager(connection_class=connection_class, outbox=stompman.Outbox()) as manager:
+        assert manager._active_connection_state
+        await manager._discard_failed_connection_state(
+            manager._active_connection_state, build_dataclass(ConnectionLostError)
+        )
+        written = await manager.send_frame(make_send_frame(b"body"))
+
+    with pytest.raises(stompman.ClientClosedError):
+        await written
+
+
 SIDE_EFFECTS = [
     (None,),
     (build_dataclass(ConnectionLostError), None),
@@ -636,3 +1070,54 @@ async def test_maybe_write_frame_logs_dropped_unsubscribe_at_info(
         wrote = await manager.maybe_write_frame(stompman.UnsubscribeFrame(headers={"id": "s"}))
     assert wrote is False
     assert any(r.levelno == logging.INFO and "dropping unsubscribeframe" in r.message.lower() for r in caplog.records)
+
+
+async def test_maybe_write_ack_frame_logs_dropped_ack(caplog: pytest.LogCaptureFixture) -> None:
+    manager = EnrichedConnectionManager(connection_class=BaseMockConnection)
+    with caplog.at_level(logging.WARNING, logger="stompman"):
+        wrote = await manager.maybe_write_ack_frame(
+            stompman.AckFrame, ack_id="a", subscription_id="s", parts=[b"ACK\nid:a\nsubscription:s\n\n\x00"]
+        )
+    assert wrote is False
+    assert any(
+        r.levelno == logging.WARNING and "dropping ack" in r.message.lower() and "ack_id=a" in r.message
+        for r in caplog.records
+    )
+
+
+async def test_maybe_write_ack_frame_connection_now_lost(caplog: pytest.LogCaptureFixture) -> None:
+    class MockConnection(BaseMockConnection):
+        write_frame_parts = mock.AsyncMock(side_effect=[build_dataclass(ConnectionLostError)])
+
+    async with EnrichedConnectionManager(connection_class=MockConnection) as manager:
+        with caplog.at_level(logging.ERROR, logger="stompman"):
+            assert not await manager.maybe_write_ack_frame(
+                stompman.NackFrame, ack_id="a", subscription_id="s", parts=[b"NACK\nid:a\nsubscription:s\n\n\x00"]
+            )
+    assert any(r.levelno == logging.ERROR and "dropping nack" in r.message.lower() for r in caplog.records)
+
+
+async def test_maybe_write_ack_frame_writes_parts() -> None:
+    class MockConnection(BaseMockConnection):
+        write_frame_parts = mock.AsyncMock()
+
+    parts: list[BytesLike] = [b"ACK\nid:a\nsubscription:s\n\n\x00"]
+    async with EnrichedConnectionManager(connection_class=MockConnection) as manager:
+        assert await manager.maybe_write_ack_frame(stompman.AckFrame, ack_id="a", subscription_id="s", parts=parts)
+
+    assert MockConnection.write_frame_parts.mock_calls == [mock.call(parts)]
+
+
+async def test_maybe_write_ack_frame_without_write_frame_parts_writes_frame() -> None:
+    write_frame = mock.AsyncMock()
+    connection = mock.Mock(spec=["write_frame"], write_frame=write_frame)
+    manager = EnrichedConnectionManager(connection_class=BaseMockConnection)
+    manager._active_connection_state = ActiveConnectionState(
+        connection=connection, lifespan=mock.Mock(), server_heartbeat=build_dataclass(Heartbeat), connected_at=0
+    )
+
+    assert await manager.maybe_write_ack_frame(
+        stompman.AckFrame, ack_id="a", subscription_id="s", parts=[b"ACK\nid:a\nsubscription:s\n\n\x00"]
+    )
+
+    assert write_frame.mock_calls == [mock.call(stompman.AckFrame(headers={"id": "a", "subscription": "s"}))]
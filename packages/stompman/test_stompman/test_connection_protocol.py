@@ -0,0 +1,174 @@
+import asyncio
+import socket
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+import pytest
+from stompman import (
+    AnyServerFrame,
+    CommitFrame,
+    ConnectedFrame,
+    ConnectionLostError,
+    HeartbeatFrame,
+    MessageFrame,
+    SocketOptions,
+)
+from stompman.connection_protocol import (
+    MIN_READ_CHUNK_SIZE,
+    AdaptiveReadChunkSize,
+    BufferedProtocolConnection,
+    BufferedStreamProtocol,
+    BufferedStreamReader,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@asynccontextmanager
+async def serve(response: bytes, received: list[bytes]) -> AsyncGenerator[tuple[str, int], None]:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(response)
+        await writer.drain()
+        received.append(await reader.read(1024))
+        writer.close()
+
+    server = await asyncio.start_server(handle, host="127.0.0.1", port=0)
+    async with server:
+        yield server.sockets[0].getsockname()[:2]
+
+
+async def test_buffered_protocol_connection() -> None:
+    body = b"a" * 5000
+    response = (
+        b"CONNECTED\nversion:1.2\n\n\x00\n"
+        b"MESSAGE\ndestination:queue\nmessage-id:1\nsubscription:1\ncontent-length:5000\n\n" + body + b"\x00"
+    )
+    received: list[bytes] = []
+
+    async with serve(response, received) as (host, port):
+        connection = await BufferedProtocolConnection.connect(
+            host=host, port=port, timeout=2, read_max_chunk_size=1000, ssl=None
+        )
+        assert connection
+        await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
+
+        frames: list[AnyServerFrame] = []
+
+        async def read_all_frames() -> None:
+            async for frame in connection.read_frames():
+                frames.append(frame)  # ruff: ignore[manual-list-comprehension]
+
+        with pytest.raises(ConnectionLostError):
+            await read_all_frames()
+        await connection.close()
+
+    assert received == [b"COMMIT\ntransaction:transaction\n\n\x00"]
+    assert frames == [
+        ConnectedFrame(headers={"version": "1.2"}),
+        HeartbeatFrame(),
+        MessageFrame(
+            headers={"destination": "queue", "message-id": "1", "subscription": "1", "content-length": "5000"},
+            body=body,
+        ),
+    ]
+
+
+async def test_buffered_protocol_connection_connect_error() -> None:
+    server = await asyncio.start_server(lambda *_: None, host="127.0.0.1", port=0)
+    host, port = server.sockets[0].getsockname()[:2]
+    server.close()
+    await server.wait_closed()
+
+    assert not await BufferedProtocolConnection.connect(
+        host=host, port=port, timeout=2, read_max_chunk_size=1000, ssl=None
+    )
+
+
+async def test_buffered_stream_reader_joins_chunks_up_to_limit() -> None:
+    reader = BufferedStreamReader()
+    for chunk in (b"ab", b"cd", b"ef", b"gh"):
+        reader.feed_data(chunk)
+    reader.feed_eof()
+
+    assert [await reader.read(5), await reader.read(5), await reader.read(5)] == [b"abcd", b"efgh", b""]
+
+
+async def test_buffered_stream_reader_raises_exception() -> None:
+    reader = BufferedStreamReader()
+    read_task = asyncio.create_task(reader.read(5))
+    await asyncio.sleep(0)
+    reader.set_exception(ConnectionResetError())
+
+    with pytest.raises(ConnectionResetError):
+        await read_task
+
+
+async def test_buffered_protocol_connection_apply_socket_options() -> None:
+    async with serve(b"", []) as (host, port):
+        connection = await BufferedProtocolConnection.connect(
+            host=host, port=port, timeout=2, read_max_chunk_size=1000, ssl=None
+        )
+        assert connection
+        options = SocketOptions(tcp_nodelay=True, keepalive_probes=7)
+        connection.apply_socket_options(options)
+        sock = connection.writer.get_extra_info("socket")
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT) == options.keepalive_probes
+        await connection.close()
+
+
+async def test_buffered_stream_protocol_resizes_buffer() -> None:  # ruff: ignore[unused-async]
+    reader = BufferedStreamReader()
+    protocol = BufferedStreamProtocol(reader, MIN_READ_CHUNK_SIZE * 4)
+    buffer_sizes = []
+    for bytes_read in (MIN_READ_CHUNK_SIZE, MIN_READ_CHUNK_SIZE * 2, 1, 1):
+        buffer = protocol.get_buffer(-1)
+        buffer_sizes.append(len(buffer))
+        buffer[:bytes_read] = b"\n" * bytes_read
+        protocol.buffer_updated(bytes_read)
+
+    assert buffer_sizes == [
+        MIN_READ_CHUNK_SIZE,
+        MIN_READ_CHUNK_SIZE * 2,
+        MIN_READ_CHUNK_SIZE * 4,
+        MIN_READ_CHUNK_SIZE * 2,
+    ]
+    assert len(protocol.get_buffer(-1)) == MIN_READ_CHUNK_SIZE
+
+
+async def test_buffered_protocol_connection_read_buffer_size() -> None:
+    async with serve(b"", []) as (host, port):
+        connection = await BufferedProtocolConnection.connect(
+            host=host, port=port, timeout=2, read_max_chunk_size=MIN_READ_CHUNK_SIZE * 4, ssl=None
+        )
+        assert connection
+        assert connection.read_buffer_size == MIN_READ_CHUNK_SIZE
+
+        connection.protocol.get_buffer(-1)
+        connection.protocol.buffer_updated(MIN_READ_CHUNK_SIZE)
+        assert connection.read_buffer_size == MIN_READ_CHUNK_SIZE * 2
+        await connection.close()
+
+
+def test_adaptive_read_chunk_size() -> None:
+    chunk_size = AdaptiveReadChunkSize(min_size=MIN_READ_CHUNK_SIZE, max_size=MIN_READ_CHUNK_SIZE * 4)
+    sizes = []
+    for bytes_read in (
+        MIN_READ_CHUNK_SIZE,
+        MIN_READ_CHUNK_SIZE * 2,
+        MIN_READ_CHUNK_SIZE * 4,
+        MIN_READ_CHUNK_SIZE * 2,
+        MIN_READ_CHUNK_SIZE // 2,
+        1,
+        1,
+    ):
+        chunk_size.update(bytes_read)
+        sizes.append(chunk_size.current // MIN_READ_CHUNK_SIZE)
+
+    assert sizes == [2, 4, 4, 4, 2, 1, 1]
+
+
+def test_adaptive_read_chunk_size_small_max_size() -> None:
+    chunk_size = AdaptiveReadChunkSize(min_size=MIN_READ_CHUNK_SIZE, max_size=5)
+    chunk_size.update(5)
+    assert (chunk_size.min_size, chunk_size.current) == (5, 5)
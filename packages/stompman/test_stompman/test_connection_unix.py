@@ -0,0 +1,63 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Literal
+
+import pytest
+from stompman import AnyServerFrame, CommitFrame, ConnectedFrame, ConnectionLostError, SocketOptions
+
+if sys.platform == "win32":  # pragma: no cover
+    pytest.skip("Unix domain sockets are not available", allow_module_level=True)
+
+from stompman.connection_unix import UnixSocketConnection
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_unix_socket_connection(tmp_path: Path) -> None:
+    socket_path = str(tmp_path / "stomp.sock")
+    received: list[bytes] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(b"CONNECTED\nversion:1.2\n\n\x00")
+        await writer.drain()
+        received.append(await reader.read(1024))
+        writer.close()
+
+    async with await asyncio.start_unix_server(handle, path=socket_path):
+        connection = await UnixSocketConnection.connect(
+            host=socket_path, port=0, timeout=2, read_max_chunk_size=1024, ssl=None
+        )
+        assert connection
+        connection.apply_socket_options(SocketOptions())
+        await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
+
+        frames: list[AnyServerFrame] = []
+
+        async def read_all_frames() -> None:
+            async for frame in connection.read_frames():
+                frames.append(frame)  # ruff: ignore[manual-list-comprehension]
+
+        with pytest.raises(ConnectionLostError):
+            await read_all_frames()
+        await connection.close()
+
+    assert received == [b"COMMIT\ntransaction:transaction\n\n\x00"]
+    assert frames == [ConnectedFrame(headers={"version": "1.2"})]
+
+
+async def test_unix_socket_connection_no_socket(tmp_path: Path) -> None:
+    assert not await UnixSocketConnection.connect(
+        host=str(tmp_path / "missing.sock"), port=0, timeout=2, read_max_chunk_size=1024, ssl=None
+    )
+
+
+@pytest.mark.parametrize(
+    ("ssl", "ws_uri_path"),
+    [(True, None), (None, "/ws")],
+)
+async def test_unix_socket_connection_unsupported_arguments(ssl: Literal[True] | None, ws_uri_path: str | None) -> None:
+    with pytest.raises(AssertionError):
+        await UnixSocketConnection.connect(
+            host="stomp.sock", port=0, timeout=2, read_max_chunk_size=1024, ssl=ssl, ws_uri_path=ws_uri_path
+        )
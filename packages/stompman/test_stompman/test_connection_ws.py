@@ -16,7 +16,8 @@ from stompman import (
 from stompman.serde import NEWLINE
 
 pytest.importorskip("stompman.connection_ws")
-from stompman.connection_ws import WebSocketConnection
+from stompman.connection_ws import WebSocketCompression, WebSocketConnection
+from websockets.asyncio.server import ServerConnection, serve  # type: ignore[import-not-found,unused-ignore]
 from websockets.exceptions import WebSocketException  # type: ignore[import-not-found,unused-ignore]
 
 pytestmark = pytest.mark.anyio
@@ -80,6 +81,7 @@ async def test_connection_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
 
     connection = await make_mocked_connection(monkeypatch, MockReader())
     connection.write_heartbeat()
+    await asyncio.sleep(0)
     await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
 
     async def take_frames(count: int) -> list[AnyServerFrame]:
@@ -117,10 +119,54 @@ async def test_connection_write_heartbeat_runtime_error(monkeypatch: pytest.Monk
         close = mock.AsyncMock()
 
     connection = await make_mocked_connection(monkeypatch, MockWriter())
+    connection.write_heartbeat()
+    await asyncio.sleep(0)
     with pytest.raises(ConnectionLostError):
         connection.write_heartbeat()
 
 
+async def test_connection_write_heartbeat_skipped_after_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    class MockWriter:
+        send = mock.AsyncMock()
+        close = mock.AsyncMock()
+
+    connection = await make_mocked_connection(monkeypatch, MockWriter())
+    await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
+    connection.write_heartbeat()
+    await asyncio.sleep(0)
+    connection.write_heartbeat()
+    await asyncio.sleep(0)
+
+    assert MockWriter.send.mock_calls == [
+        mock.call(b"COMMIT\ntransaction:transaction\n\n\x00", text=True),
+        mock.call(NEWLINE, text=True),
+    ]
+
+
+async def test_connection_write_heartbeat_reuses_pending_send(monkeypatch: pytest.MonkeyPatch) -> None:
+    send_started, send_allowed = asyncio.Event(), asyncio.Event()
+
+    async def send_slowly(message: bytes, *, text: bool) -> None:
+        del message, text
+        send_started.set()
+        await send_allowed.wait()
+
+    class MockWriter:
+        send = mock.AsyncMock(side_effect=send_slowly)
+        close = mock.AsyncMock()
+
+    connection = await make_mocked_connection(monkeypatch, MockWriter())
+    connection.write_heartbeat()
+    await send_started.wait()
+    connection.write_heartbeat()
+    connection.write_heartbeat()
+    send_allowed.set()
+    await asyncio.sleep(0)
+    await connection.close()
+
+    assert MockWriter.send.mock_calls == [mock.call(NEWLINE, text=True)]
+
+
 async def test_connection_write_frame_connection_error(monkeypatch: pytest.MonkeyPatch) -> None:
     class MockWriter:
         send = mock.AsyncMock(side_effect=WebSocketException)
@@ -141,6 +187,17 @@ async def test_connection_write_frame_runtime_error(monkeypatch: pytest.MonkeyPa
         await connection.write_frame(BeginFrame(headers={"transaction": ""}))
 
 
+async def test_connection_write_frame_parts(monkeypatch: pytest.MonkeyPatch) -> None:
+    class MockWriter:
+        send = mock.AsyncMock()
+        close = mock.AsyncMock()
+
+    connection = await make_mocked_connection(monkeypatch, MockWriter())
+    await connection.write_frame_parts([b"SEND\ndestination:queue\n\n", memoryview(b"body"), b"\x00"])
+
+    assert MockWriter.send.mock_calls == [mock.call(b"SEND\ndestination:queue\n\nbody\x00", text=True)]
+
+
 async def test_connection_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
     mock_wait_for(monkeypatch)
     assert not await make_connection_ws()
@@ -157,3 +214,55 @@ async def test_read_frames_connection_error(monkeypatch: pytest.MonkeyPatch, exc
     connection = await make_mocked_connection(monkeypatch, mock.AsyncMock(recv=mock.AsyncMock(side_effect=exception)))
     with pytest.raises(ConnectionLostError):
         _ = [frame async for frame in connection.read_frames()]
+
+
+class CompressedBinaryWebSocketConnection(WebSocketConnection):
+    binary_frames = True
+    compression = WebSocketCompression(level=1, client_max_window_bits=10)
+
+
+class UncompressedWebSocketConnection(WebSocketConnection):
+    compression = None
+
+
+@pytest.mark.parametrize(
+    ("connection_class", "expected_message", "expected_extensions"),
+    [
+        (
+            WebSocketConnection,
+            "COMMIT\ntransaction:transaction\n\n\x00",
+            "permessage-deflate; server_max_window_bits=12; client_max_window_bits=12",
+        ),
+        (
+            CompressedBinaryWebSocketConnection,
+            b"COMMIT\ntransaction:transaction\n\n\x00",
+            "permessage-deflate; server_max_window_bits=12; client_max_window_bits=10",
+        ),
+        (UncompressedWebSocketConnection, "COMMIT\ntransaction:transaction\n\n\x00", None),
+    ],
+)
+async def test_connection_framing_and_compression(
+    connection_class: type[WebSocketConnection], expected_message: str | bytes, expected_extensions: str | None
+) -> None:
+    received_messages: list[str | bytes] = []
+
+    async def handle(websocket: ServerConnection) -> None:
+        received_messages.append(await websocket.recv())
+        await websocket.send(b"CONNECTED\nversion:1.2\n\n\x00")
+        await websocket.wait_closed()
+
+    async with serve(handle, "127.0.0.1", 0) as server:
+        host, port = next(iter(server.sockets)).getsockname()[:2]
+        connection = await connection_class.connect(
+            host=host, port=port, timeout=2, read_max_chunk_size=1024 * 1024, ssl=None
+        )
+        assert connection
+        assert connection.websocket.response
+        extensions = connection.websocket.response.headers.get("Sec-WebSocket-Extensions")
+        await connection.write_frame(CommitFrame(headers={"transaction": "transaction"}))
+        frame = await anext(connection.read_frames())
+        await connection.close()
+
+    assert extensions == expected_extensions
+    assert received_messages == [expected_message]
+    assert frame == ConnectedFrame(headers={"version": "1.2"})
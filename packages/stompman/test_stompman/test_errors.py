@@ -8,7 +8,12 @@ from test_stompman.conftest import build_dataclass
 
 @pytest.mark.parametrize(
     "class_",
-    [stompman.ConnectionLostError, stompman.FailedAllConnectAttemptsError, stompman.FailedAllWriteAttemptsError],
+    [
+        stompman.ConnectionLostError,
+        stompman.FailedAllConnectAttemptsError,
+        stompman.FailedAllWriteAttemptsError,
+        stompman.ClientClosedError,
+    ],
 )
 def test_error_str(class_: Any) -> None:  # noqa: ANN401
     error = build_dataclass(class_)
@@ -1,4 +1,13 @@
+import copy
+import json
+import mmap
+import struct
+from collections.abc import Iterator
+from contextlib import suppress
+from itertools import pairwise
+
 import pytest
+from hypothesis import given, strategies
 from stompman import (
     AckFrame,
     AnyClientFrame,
@@ -6,18 +15,45 @@ from stompman import (
     ConnectedFrame,
     ConnectFrame,
     ErrorFrame,
+    FrameLimitExceededError,
     FrameParser,
     HeartbeatFrame,
     MessageFrame,
+    NackFrame,
+    RawMessageFrame,
+    SendFrame,
     dump_frame,
 )
-from stompman.serde import NEWLINE
+from stompman.serde import (
+    BACKSLASH,
+    CARRIAGE,
+    COLON_,
+    COMMANDS_TO_FRAMES,
+    HEADER_UNESCAPE_CHARS,
+    MAX_RETAINED_BUFFER_SIZE,
+    NEWLINE,
+    NULL,
+    LazyHeaders,
+    dump_ack_frame,
+    dump_ack_frame_suffix,
+    dump_frame_parts,
+    make_frame_from_parts,
+    parse_header,
+)
 
 
 @pytest.mark.parametrize(
     ("frame", "dumped_frame"),
     [
-        (AckFrame(headers={"subscription": "1", "id": "1"}), (b"ACK\nid:1\nsubscription:1\n\n\x00")),
+        (AckFrame(headers={"subscription": "1", "id": "1"}), (b"ACK\nsubscription:1\nid:1\n\n\x00")),
+        (
+            ConnectFrame(headers={"accept-version": "1.2", "host": "/", "passcode": "a:b\\c"}),
+            (b"CONNECT\naccept-version:1.2\nhost:/\npasscode:a:b\\c\n\n\x00"),
+        ),
+        (
+            SendFrame(headers={"destination": "a\rb", "content-type": "text/plain"}, body=b"hi"),
+            (b"SEND\ndestination:ab\ncontent-type:text/plain\n\nhi\x00"),
+        ),
         (ConnectedFrame(headers={"version": "1.1"}), (b"CONNECTED\nversion:1.1\n\n\x00")),
         (
             MessageFrame(
@@ -35,6 +71,37 @@ def test_dump_frame(frame: AnyClientFrame, dumped_frame: bytes) -> None:
     assert dump_frame(frame) == dumped_frame
 
 
+@pytest.mark.parametrize(
+    "frame",
+    [
+        AckFrame(headers={"subscription": "1", "id": "1"}),
+        ConnectFrame(headers={"accept-version": "1.2", "host": "/"}),
+        SendFrame(headers={"destination": "a:b"}),
+        SendFrame(headers={"destination": "a:b"}, body=b"body"),
+        SendFrame(headers={"destination": "a:b"}, body=bytearray(b"body")),
+        SendFrame(headers={"destination": "a:b"}, body=memoryview(b"body")),
+        MessageFrame(headers={"destination": "", "message-id": "", "subscription": ""}, body=b"body"),
+    ],
+)
+def test_dump_frame_parts(frame: AnyClientFrame) -> None:
+    parts = dump_frame_parts(frame)
+
+    assert b"".join(parts) == dump_frame(frame)
+    if getattr(frame, "body", None):
+        assert parts[1] is frame.body  # type: ignore[union-attr]
+
+
+@pytest.mark.parametrize("frame_type", [AckFrame, NackFrame])
+@pytest.mark.parametrize(("ack_id", "subscription_id"), [("1", "2"), ("ID:host-1:2:3", "a\\b\nc")])
+def test_dump_ack_frame(frame_type: type[AckFrame | NackFrame], ack_id: str, subscription_id: str) -> None:
+    dumped_frame = dump_ack_frame(frame_type, ack_id=ack_id, suffix=dump_ack_frame_suffix(subscription_id))
+
+    assert dumped_frame == dump_frame(frame_type(headers={"id": ack_id, "subscription": subscription_id}))
+    assert list(FrameParser().parse_frames_from_chunk(dumped_frame)) == [
+        frame_type(headers={"id": ack_id, "subscription": subscription_id})
+    ]
+
+
 @pytest.mark.parametrize(
     ("raw_frames", "loaded_frames"),
     [
@@ -242,7 +309,423 @@ def test_dump_frame(frame: AnyClientFrame, dumped_frame: bytes) -> None:
             b"MESSAGE\ncontent-length:10\n\nShortMOREDATA\x00",
             [MessageFrame(headers={"content-length": "10"}, body=b"ShortMORED")],  # type: ignore[typeddict-item]
         ),
+        # Negative content-length is ignored
+        (
+            b"MESSAGE\ncontent-length:-1\n\nBody\x00\n",
+            [MessageFrame(headers={"content-length": "-1"}, body=b"Body"), HeartbeatFrame()],  # type: ignore[typeddict-item]
+        ),
     ],
 )
 def test_load_frames(raw_frames: bytes, loaded_frames: list[AnyServerFrame]) -> None:
     assert list(FrameParser().parse_frames_from_chunk(raw_frames)) == loaded_frames
+
+
+def test_load_frame_with_content_length_across_chunks() -> None:
+    body = b"\x00".join([b"a" * 1000, b"b" * 1000, b"c" * 1000])
+    raw_frame = b"MESSAGE\ncontent-length:" + str(len(body)).encode() + b"\n\n" + body + b"\x00\n"
+    parser = FrameParser()
+
+    assert list(parser.parse_frames_from_chunk(raw_frame[:100])) == []
+    assert len(parser._buffer) == len(raw_frame[:100])
+    assert list(parser.parse_frames_from_chunk(raw_frame[100:2000])) == []
+    assert list(parser.parse_frames_from_chunk(raw_frame[2000:])) == [
+        MessageFrame(headers={"content-length": str(len(body))}, body=body),  # type: ignore[typeddict-item]
+        HeartbeatFrame(),
+    ]
+    assert parser._buffer_length == 0
+
+
+def test_parser_reuses_buffer_between_frames() -> None:
+    raw_frame = b"MESSAGE\ndestination:queue\n\nBody\x00"
+    parser = FrameParser()
+    buffer = parser._buffer
+
+    for _ in range(3):
+        assert list(parser.parse_frames_from_chunk(raw_frame[:15])) == []
+        assert list(parser.parse_frames_from_chunk(raw_frame[15:])) == [
+            MessageFrame(headers={"destination": "queue"}, body=b"Body")  # type: ignore[typeddict-item]
+        ]
+        assert parser._buffer is buffer
+        assert parser._buffer_length == 0
+
+
+def test_parser_releases_buffer_after_large_frame() -> None:
+    body = b"a" * (MAX_RETAINED_BUFFER_SIZE + 1)
+    raw_frame = b"MESSAGE\ncontent-length:" + str(len(body)).encode() + b"\n\n" + body + b"\x00"
+    parser = FrameParser()
+
+    assert list(parser.parse_frames_from_chunk(raw_frame[:100])) == []
+    assert list(parser.parse_frames_from_chunk(raw_frame[100:-1])) == []
+    assert len(parser._buffer) == len(body)
+    assert list(parser.parse_frames_from_chunk(raw_frame[-1:])) == [
+        MessageFrame(headers={"content-length": str(len(body))}, body=body)  # type: ignore[typeddict-item]
+    ]
+    assert parser._buffer == bytearray()
+
+
+def test_parser_does_not_allocate_declared_content_length_up_front() -> None:
+    raw_frame_start = b"MESSAGE\ncontent-length:" + str(2**50).encode() + b"\n\nshort body"
+    parser = FrameParser()
+
+    assert list(parser.parse_frames_from_chunk(raw_frame_start)) == []
+    assert len(parser._buffer) <= len(raw_frame_start)
+    assert parser._buffer_length == len(b"short body")
+
+
+def _reference_parse_header(buffer: bytes) -> tuple[str, str] | None:
+    key_buffer = bytearray()
+    value_buffer = bytearray()
+    key_parsed = False
+    previous_byte = None
+    just_escaped_line = False
+
+    for byte in struct.unpack(f"{len(buffer)!s}c", buffer):
+        if byte == COLON_:
+            if key_parsed:
+                return None
+            key_parsed = True
+        elif just_escaped_line:
+            just_escaped_line = False
+            if byte != BACKSLASH:
+                (value_buffer if key_parsed else key_buffer).extend(byte)
+        elif unescaped_byte := (
+            HEADER_UNESCAPE_CHARS.get(byte) if previous_byte == BACKSLASH else None if byte == BACKSLASH else byte
+        ):
+            just_escaped_line = True
+            (value_buffer if key_parsed else key_buffer).extend(unescaped_byte)
+        previous_byte = byte
+
+    if key_parsed:
+        with suppress(UnicodeDecodeError):
+            return key_buffer.decode(), value_buffer.decode()
+    return None
+
+
+class ReferenceFrameParser:
+    """Byte-by-byte parser that FrameParser must stay equivalent to."""
+
+    def __init__(self) -> None:
+        self._previous_byte: bytes | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._current_buf = bytearray()
+        self._headers_processed = False
+        self._command: bytes | None = None
+        self._headers: dict[str, str] = {}
+        self._content_length: int | None = None
+
+    def _handle_null_byte(self) -> Iterator[AnyClientFrame | AnyServerFrame]:
+        if not self._command or not self._headers_processed:
+            self._reset()
+            return
+        if self._content_length is not None and self._content_length != len(self._current_buf):
+            self._current_buf += NULL
+            return
+        yield make_frame_from_parts(command=self._command, headers=self._headers, body=bytes(self._current_buf))
+        self._reset()
+
+    def _handle_newline_byte(self) -> Iterator[HeartbeatFrame]:
+        if not self._current_buf and not self._command:
+            yield HeartbeatFrame()
+            return
+        if self._previous_byte == CARRIAGE:
+            self._current_buf.pop()
+        self._headers_processed = not self._current_buf
+
+        if self._command:
+            header = _reference_parse_header(bytes(self._current_buf))
+            if header and header[0] not in self._headers:
+                self._headers[header[0]] = header[1]
+                if header[0].lower() == "content-length":
+                    with suppress(ValueError):
+                        self._content_length = int(header[1])
+            self._current_buf = bytearray()
+        elif bytes(self._current_buf) in COMMANDS_TO_FRAMES:
+            self._command = bytes(self._current_buf)
+            self._current_buf = bytearray()
+        else:
+            self._reset()
+
+    def parse_frames_from_chunk(self, chunk: bytes) -> Iterator[AnyClientFrame | AnyServerFrame]:
+        for byte in struct.unpack(f"{len(chunk)!s}c", chunk):
+            if byte == NULL:
+                yield from self._handle_null_byte()
+            elif self._headers_processed:
+                if self._content_length is None or self._content_length != len(self._current_buf):
+                    self._current_buf += byte
+            elif byte == NEWLINE:
+                yield from self._handle_newline_byte()
+            else:
+                self._current_buf += byte
+            self._previous_byte = byte
+
+
+stream_fragment_strategy = strategies.sampled_from(
+    [
+        *COMMANDS_TO_FRAMES,
+        b"WHATEVER",
+        b"destination:/queue/a",
+        b"content-length:",
+        b"content-length:0",
+        b"content-length:3",
+        b"content-length:12",
+        b"header:value",
+        b"\\c",
+        b"\\n",
+        b"\\\\",
+        b"\\r",
+        b"\\",
+        b":",
+        b"\r",
+        b"\n",
+        b"\r\n",
+        b"\n\n",
+        b"\x00",
+        b"\x00\n",
+        b"\xc3\xa7",
+        b"\xff",
+        b"body",
+        b"a" * 100,
+    ]
+)
+noise_strategy = stream_fragment_strategy | strategies.binary(max_size=8)
+line_end_strategy = strategies.sampled_from([b"\n", b"\r\n"])
+frame_like_strategy = strategies.tuples(
+    strategies.sampled_from(list(COMMANDS_TO_FRAMES)),
+    line_end_strategy,
+    strategies.lists(strategies.tuples(strategies.lists(noise_strategy, max_size=4).map(b"".join), line_end_strategy)),
+    line_end_strategy,
+    strategies.lists(noise_strategy, max_size=4).map(b"".join),
+).map(
+    lambda parts: b"".join(
+        (parts[0], parts[1], *(line + line_end for line, line_end in parts[2]), parts[3], parts[4], NULL)
+    )
+)
+stream_strategy = strategies.lists(frame_like_strategy | noise_strategy).map(b"".join)
+
+
+@given(stream=stream_strategy, split_points=strategies.lists(strategies.integers(min_value=0)))
+def test_parser_matches_reference_implementation(stream: bytes, split_points: list[int]) -> None:
+    boundaries = sorted({point % (len(stream) + 1) for point in split_points} | {0, len(stream)})
+    chunks = [stream[start:end] for start, end in pairwise(boundaries)]
+    parser = FrameParser()
+    reference_parser = ReferenceFrameParser()
+
+    assert [frame for chunk in chunks for frame in parser.parse_frames_from_chunk(chunk)] == [
+        frame for chunk in chunks for frame in reference_parser.parse_frames_from_chunk(chunk)
+    ]
+
+
+@given(
+    strategies.lists(
+        strategies.sampled_from([b":", b"\\", b"c", b"n", b"r", b"\r", b"\n", b"a", b"\xc3", b"\xa7"])
+    ).map(b"".join)
+)
+def test_parse_header_matches_reference_implementation(header: bytes) -> None:
+    assert parse_header(header) == _reference_parse_header(header)
+
+
+def test_parse_header_interns_known_keys() -> None:
+    first_frame, second_frame = FrameParser().parse_frames_from_chunk(
+        b"MESSAGE\nmessage-id:1\nsubscription:2\n\n\x00MESSAGE\nmessage-id:3\nsubscription:4\n\n\x00"
+    )
+    assert isinstance(first_frame, MessageFrame)
+    assert isinstance(second_frame, MessageFrame)
+    for first_key, second_key in zip(first_frame.headers, second_frame.headers, strict=True):
+        assert first_key is second_key
+
+
+def test_load_raw_message_frames() -> None:
+    raw_frames = (
+        b"MESSAGE\nsubscription:raw\nmessage-id:1\n\nfirst\x00"
+        b"MESSAGE\nsubscription:other\nmessage-id:2\n\nsecond\x00"
+        b"MESSAGE\ncontent-length:5\nsubscription:raw\nmessage-id:3\n\nth\x00rd\x00"
+    )
+    parser = FrameParser(raw_message_subscription_ids={"raw"})
+
+    first_frame, second_frame, third_frame = parser.parse_frames_from_chunk(raw_frames)
+
+    assert isinstance(first_frame, RawMessageFrame)
+    assert isinstance(first_frame.body, memoryview)
+    assert first_frame.command == b"MESSAGE"
+    assert first_frame.to_message_frame() == MessageFrame(
+        headers={"subscription": "raw", "message-id": "1"},  # type: ignore[typeddict-item]
+        body=b"first",
+    )
+    assert second_frame == MessageFrame(headers={"subscription": "other", "message-id": "2"}, body=b"second")  # type: ignore[typeddict-item]
+    assert isinstance(third_frame, RawMessageFrame)
+    assert third_frame.headers["message-id"] == "3"
+    assert third_frame.body.tobytes() == b"th\x00rd"
+
+
+def test_load_raw_message_frame_across_chunks() -> None:
+    raw_frame = b"MESSAGE\nsubscription:raw\n\n" + b"a" * 100 + b"\x00"
+    parser = FrameParser(raw_message_subscription_ids={"raw"})
+
+    assert list(parser.parse_frames_from_chunk(raw_frame[:50])) == []
+    (frame,) = parser.parse_frames_from_chunk(raw_frame[50:])
+
+    assert isinstance(frame, RawMessageFrame)
+    assert frame.body == b"a" * 100
+
+
+def test_lazy_headers() -> None:
+    header_lines = [b"destination:/queue/a", b"key\\c:value\\n", b"broken", b"destination:/queue/b"]
+    headers = LazyHeaders(header_lines)
+
+    assert headers["destination"] == "/queue/a"
+    assert headers.get("key:") == "value\n"
+    assert headers.get("missing", "default") == "default"
+    assert "destination" in headers
+    assert "broken" not in headers
+    assert headers._header_lines is not None
+    with pytest.raises(KeyError):
+        headers["missing"]
+
+    assert headers == {"destination": "/queue/a", "key:": "value\n"}
+    assert headers._header_lines is None
+    assert list(headers) == ["destination", "key:"]
+    assert dict(headers) == {"destination": "/queue/a", "key:": "value\n"}
+    assert copy.deepcopy(headers) == headers
+    assert json.dumps(dict(headers)) == '{"destination": "/queue/a", "key:": "value\\n"}'
+
+
+def test_lazy_headers_equality() -> None:
+    header_lines = [b"destination:/queue/a", b"message-id:1"]
+
+    assert LazyHeaders(header_lines) == LazyHeaders(list(header_lines))
+    assert LazyHeaders(header_lines) != LazyHeaders([b"destination:/queue/b"])
+    assert {"destination": "/queue/a", "message-id": "1"} == LazyHeaders(header_lines)  # ruff: ignore[yoda-conditions]
+    assert LazyHeaders(header_lines) != {"destination": "/queue/a"}
+    assert LazyHeaders(header_lines) != [("destination", "/queue/a"), ("message-id", "1")]
+
+
+def test_message_frame_headers_are_plain_dict() -> None:
+    raw_frame = b"MESSAGE\nmessage-id:1\nsubscription:2\n\nbody\x00"
+
+    (frame,) = FrameParser().parse_frames_from_chunk(raw_frame)
+
+    assert isinstance(frame, MessageFrame)
+    assert type(frame.headers) is dict
+    assert json.dumps(frame.headers) == '{"message-id": "1", "subscription": "2"}'
+    assert list(FrameParser().parse_frames_from_chunk(raw_frame)) == [frame]
+
+
+def test_raw_message_frame_headers_are_decoded_lazily() -> None:
+    raw_frame = b"MESSAGE\nmessage-id:1\nJMSXGroupID:group\nsubscription:2\nack:3\ncontent-length:4\n\nbody\x00"
+    (frame,) = FrameParser(raw_message_subscription_ids={"2"}).parse_frames_from_chunk(raw_frame)
+
+    assert isinstance(frame, RawMessageFrame)
+    assert isinstance(frame.headers, LazyHeaders)
+    assert frame.headers["subscription"] == "2"
+    assert frame.headers.get("ack") == "3"
+    assert frame.headers._header_lines is not None
+    assert list(FrameParser(raw_message_subscription_ids={"2"}).parse_frames_from_chunk(raw_frame)) == [frame]
+    assert frame.to_message_frame() == MessageFrame(
+        headers={  # type: ignore[typeddict-item]
+            "message-id": "1",
+            "JMSXGroupID": "group",
+            "subscription": "2",
+            "ack": "3",
+            "content-length": "4",
+        },
+        body=b"body",
+    )
+    assert type(frame.to_message_frame().headers) is dict
+    assert list(frame.headers) == ["message-id", "JMSXGroupID", "subscription", "ack", "content-length"]
+
+
+@pytest.mark.parametrize(
+    "raw_frame",
+    [
+        b"MESSAGE\nsubscription:raw\ncontent-length:100\n\n" + b"a" * 50 + b"\x00" + b"b" * 49 + b"\x00",
+        b"MESSAGE\nsubscription:raw\n\n" + b"a" * 50 + b"b" * 50 + b"\x00",
+    ],
+)
+def test_spool_large_raw_message_body(raw_frame: bytes) -> None:
+    parser = FrameParser(raw_message_subscription_ids={"raw"}, raw_message_spool_threshold=10)
+
+    frames = [
+        frame
+        for start in range(0, len(raw_frame), 8)
+        for frame in parser.parse_frames_from_chunk(raw_frame[start : start + 8])
+    ]
+
+    assert parser._spool is None
+    (frame,) = frames
+    assert isinstance(frame, RawMessageFrame)
+    assert isinstance(frame.body.obj, mmap.mmap)
+    assert frame.body.readonly
+    assert frame.body.tobytes() == raw_frame[raw_frame.index(b"\n\n") + 2 : -1]
+
+
+@pytest.mark.parametrize(
+    ("raw_message_subscription_ids", "raw_frame"),
+    [
+        ({"raw"}, b"MESSAGE\nsubscription:raw\n\n" + b"a" * 10 + b"\x00"),
+        ({"raw"}, b"MESSAGE\nsubscription:raw\ncontent-length:10\n\n" + b"a" * 10 + b"\x00"),
+        ({"other"}, b"MESSAGE\nsubscription:raw\ncontent-length:100\n\n" + b"a" * 100 + b"\x00"),
+    ],
+)
+def test_do_not_spool_small_or_regular_message_body(raw_message_subscription_ids: set[str], raw_frame: bytes) -> None:
+    parser = FrameParser(raw_message_subscription_ids=raw_message_subscription_ids, raw_message_spool_threshold=10)
+
+    (frame,) = [
+        frame
+        for start in range(0, len(raw_frame), 8)
+        for frame in parser.parse_frames_from_chunk(raw_frame[start : start + 8])
+    ]
+
+    assert not isinstance(getattr(frame.body, "obj", None), mmap.mmap)  # type: ignore[union-attr]
+
+
+@pytest.mark.parametrize(
+    ("parser", "raw_frames", "error"),
+    [
+        (
+            FrameParser(max_header_bytes=20),
+            [b"MESSAGE\ndestination:", b"/queue/a\n\n\x00"],
+            FrameLimitExceededError(limit_name="max_header_bytes", limit=20, value=27),
+        ),
+        (
+            FrameParser(max_header_bytes=20),
+            [b"garbage without newline" * 2],
+            FrameLimitExceededError(limit_name="max_header_bytes", limit=20, value=46),
+        ),
+        (
+            FrameParser(max_headers=2),
+            [b"MESSAGE\na:1\nb:2\nc:3\n\n\x00"],
+            FrameLimitExceededError(limit_name="max_headers", limit=2, value=3),
+        ),
+        (
+            FrameParser(max_frame_size=30),
+            [b"MESSAGE\ncontent-length:100\n\n"],
+            FrameLimitExceededError(limit_name="max_frame_size", limit=30, value=125),
+        ),
+        (
+            FrameParser(max_frame_size=30),
+            [b"MESSAGE\n\n" + b"a" * 10, b"a" * 20],
+            FrameLimitExceededError(limit_name="max_frame_size", limit=30, value=37),
+        ),
+    ],
+)
+def test_frame_limits_exceeded(parser: FrameParser, raw_frames: list[bytes], error: FrameLimitExceededError) -> None:
+    with pytest.raises(FrameLimitExceededError) as exc_info:
+        [frame for raw_frame in raw_frames for frame in parser.parse_frames_from_chunk(raw_frame)]
+
+    assert exc_info.value == error
+
+
+def test_frame_limits_are_per_frame() -> None:
+    raw_frame = b"MESSAGE\na:1\nb:2\n\nbody\x00\n"
+    parser = FrameParser(max_frame_size=17, max_header_bytes=13, max_headers=2)
+
+    assert (
+        list(parser.parse_frames_from_chunk(raw_frame * 3))
+        == [
+            MessageFrame(headers={"a": "1", "b": "2"}, body=b"body"),  # type: ignore[typeddict-item]
+            HeartbeatFrame(),
+        ]
+        * 3
+    )
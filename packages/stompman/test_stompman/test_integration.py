@@ -131,8 +131,8 @@ async def test_ok(connection_parameters: stompman.ConnectionParameters) -> None:
 
 
 def generate_frames(
-    cases: list[tuple[bytes, list[stompman.AnyClientFrame | stompman.AnyServerFrame]]],
-) -> tuple[list[bytes], list[stompman.AnyClientFrame | stompman.AnyServerFrame]]:
+    cases: list[tuple[bytes, list[stompman.AnyClientFrame | stompman.AnyRealServerFrame | stompman.HeartbeatFrame]]],
+) -> tuple[list[bytes], list[stompman.AnyClientFrame | stompman.AnyRealServerFrame | stompman.HeartbeatFrame]]:
     all_bytes, all_frames = [], []
 
     for noise, frames in cases:
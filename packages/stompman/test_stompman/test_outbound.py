@@ -0,0 +1,107 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from stompman import ConnectionLostError
+from stompman.frames import BytesLike
+from stompman.outbound import OutboundScheduler
+
+pytestmark = pytest.mark.anyio
+
+SEND_PARTS: list[BytesLike] = [b"SEND\ndestination:queue\n\n", b"body", b"\x00"]
+ACK_PARTS: list[BytesLike] = [b"ACK\nid:1\nsubscription:1\n\n\x00"]
+
+
+class GatedWriter:
+    def __init__(self) -> None:
+        self.batches: list[list[BytesLike]] = []
+        self.gate = asyncio.Event()
+
+    async def __call__(self, parts: list[BytesLike]) -> None:
+        self.batches.append(parts)
+        await self.gate.wait()
+
+
+async def run_pending_tasks() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_outbound_scheduler_writes_control_frames_before_send_frames() -> None:
+    writer = GatedWriter()
+    scheduler = OutboundScheduler(write=writer, max_queued_send_frames=10)
+
+    send_tasks = [asyncio.create_task(scheduler.write_send_frame(SEND_PARTS)) for _ in range(3)]
+    await run_pending_tasks()
+    assert writer.batches == [SEND_PARTS]
+
+    ack_task = asyncio.create_task(scheduler.write_control_frame(ACK_PARTS))
+    await run_pending_tasks()
+    scheduler.write_heartbeat()
+    writer.gate.set()
+    await asyncio.gather(*send_tasks, ack_task)
+
+    assert writer.batches == [SEND_PARTS, [b"\n", *ACK_PARTS, *SEND_PARTS], SEND_PARTS]
+
+
+async def test_outbound_scheduler_limits_queued_send_frames() -> None:
+    writer = GatedWriter()
+    scheduler = OutboundScheduler(write=writer, max_queued_send_frames=2)
+
+    send_tasks = [asyncio.create_task(scheduler.write_send_frame(SEND_PARTS)) for _ in range(3)]
+    await run_pending_tasks()
+
+    assert writer.batches == [SEND_PARTS]
+    assert len(scheduler._send_lane) == 1
+    assert scheduler._send_lane_slots.locked()
+    writer.gate.set()
+    await asyncio.gather(*send_tasks)
+    assert writer.batches == [SEND_PARTS] * 3
+
+
+async def test_outbound_scheduler_skips_cancelled_frames() -> None:
+    writer = GatedWriter()
+    scheduler = OutboundScheduler(write=writer, max_queued_send_frames=10)
+
+    first_task = asyncio.create_task(scheduler.write_send_frame(SEND_PARTS))
+    await run_pending_tasks()
+    cancelled_task = asyncio.create_task(scheduler.write_control_frame(ACK_PARTS))
+    await run_pending_tasks()
+    cancelled_task.cancel()
+    writer.gate.set()
+    await first_task
+
+    assert writer.batches == [SEND_PARTS]
+
+
+async def test_outbound_scheduler_write_error() -> None:
+    error = ConnectionLostError(reason="eof")
+    write = mock.AsyncMock(side_effect=error)
+    scheduler = OutboundScheduler(write=write, max_queued_send_frames=10)
+
+    results = await asyncio.gather(
+        scheduler.write_send_frame(SEND_PARTS), scheduler.write_control_frame(ACK_PARTS), return_exceptions=True
+    )
+
+    assert list(results) == [error] * 2
+    with pytest.raises(ConnectionLostError):
+        scheduler.write_heartbeat()
+    with pytest.raises(ConnectionLostError):
+        await scheduler.write_control_frame(ACK_PARTS)
+
+
+async def test_outbound_scheduler_close() -> None:
+    writer = GatedWriter()
+    scheduler = OutboundScheduler(write=writer, max_queued_send_frames=10)
+
+    tasks = [
+        asyncio.create_task(scheduler.write_send_frame(SEND_PARTS)),
+        asyncio.create_task(scheduler.write_send_frame(SEND_PARTS)),
+    ]
+    await run_pending_tasks()
+    scheduler.close()
+
+    assert [type(result) for result in await asyncio.gather(*tasks, return_exceptions=True)] == [
+        ConnectionLostError,
+        ConnectionLostError,
+    ]
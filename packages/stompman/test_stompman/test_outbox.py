@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from stompman import FailedAllConnectAttemptsError, Outbox, SendFrame
+
+from test_stompman.conftest import build_dataclass
+
+pytestmark = pytest.mark.anyio
+
+
+def make_frame(body: bytes | memoryview) -> SendFrame:
+    return SendFrame(headers={"destination": "queue"}, body=body)
+
+
+async def test_outbox_keeps_order_and_completes_written_frames() -> None:
+    outbox = Outbox()
+    first_written = await outbox.put(make_frame(b"first"))
+    second_written = await outbox.put(make_frame(memoryview(b"second")))
+
+    assert len(outbox) == 2  # ruff: ignore[magic-value-comparison]
+    assert outbox.peek() == make_frame(b"first")
+    outbox.pop_written()
+
+    assert first_written.done()
+    assert not second_written.done()
+    assert outbox.peek() == make_frame(memoryview(b"second"))
+
+
+async def test_outbox_waits_for_space_by_frames() -> None:
+    outbox = Outbox(max_frames=1)
+    await outbox.put(make_frame(b"first"))
+
+    put_task = asyncio.create_task(outbox.put(make_frame(b"second")))
+    await asyncio.sleep(0)
+    assert not put_task.done()
+
+    outbox.pop_written()
+    await put_task
+    assert outbox.peek() == make_frame(b"second")
+
+
+async def test_outbox_waits_for_space_by_bytes() -> None:
+    outbox = Outbox(max_bytes=10)
+    await outbox.put(make_frame(b"12345"))
+    await outbox.put(make_frame(b"12345"))
+
+    put_task = asyncio.create_task(outbox.put(make_frame(b"1")))
+    await asyncio.sleep(0)
+    assert not put_task.done()
+
+    outbox.pop_written()
+    await put_task
+    assert len(outbox) == 2  # ruff: ignore[magic-value-comparison]
+
+
+async def test_outbox_accepts_big_frame_when_empty() -> None:
+    outbox = Outbox(max_bytes=1)
+
+    await asyncio.wait_for(outbox.put(make_frame(b"bigger than limit")), timeout=1)
+
+
+async def test_outbox_fail_all_with_error() -> None:
+    outbox = Outbox(max_frames=1)
+    written = await outbox.put(make_frame(b"first"))
+    put_task = asyncio.create_task(outbox.put(make_frame(b"second")))
+    await asyncio.sleep(0)
+    error = build_dataclass(FailedAllConnectAttemptsError)
+
+    outbox.fail_all(error)
+
+    with pytest.raises(FailedAllConnectAttemptsError) as exc_info:
+        await written
+    assert exc_info.value is error
+    await put_task
+    assert outbox.peek() == make_frame(b"second")
+
+
+async def test_outbox_copies_bodies() -> None:
+    body = bytearray(b"body")
+    outbox = Outbox()
+    await outbox.put(make_frame(memoryview(body)))
+
+    body[:] = b"changed"
+
+    frame = outbox.peek()
+    assert frame
+    assert frame.body == b"body"
+    assert isinstance(frame.body, bytes)
+
+
+async def test_outbox_is_not_empty_while_frame_waits_for_space() -> None:
+    outbox = Outbox(max_frames=1)
+    await outbox.put(make_frame(b"first"))
+    put_task = asyncio.create_task(outbox.put(make_frame(b"second")))
+    await asyncio.sleep(0)
+
+    outbox.pop_written()
+
+    assert not outbox
+    assert not outbox.is_empty()
+    await put_task
+    assert outbox.peek() == make_frame(b"second")
+
+
+async def test_outbox_frames_waiting_for_space_are_not_overtaken() -> None:
+    outbox = Outbox(max_bytes=10)
+    await outbox.put(make_frame(b"12345"))
+    big_put_task = asyncio.create_task(outbox.put(make_frame(b"123456")))
+    await asyncio.sleep(0)
+
+    small_put_task = asyncio.create_task(outbox.put(make_frame(b"1")))
+    await asyncio.sleep(0)
+    assert not small_put_task.done()
+
+    outbox.pop_written()
+    await asyncio.gather(big_put_task, small_put_task)
+    assert outbox.peek() == make_frame(b"123456")
+    outbox.pop_written()
+    assert outbox.peek() == make_frame(b"1")
+
+
+async def test_outbox_waiter_cancellation_wakes_up_next_one() -> None:
+    outbox = Outbox(max_frames=1)
+    await outbox.put(make_frame(b"first"))
+    cancelled_put_task = asyncio.create_task(outbox.put(make_frame(b"cancelled")))
+    put_task = asyncio.create_task(outbox.put(make_frame(b"second")))
+    await asyncio.sleep(0)
+
+    outbox.pop_written()
+    cancelled_put_task.cancel()
+    await put_task
+
+    assert outbox.peek() == make_frame(b"second")
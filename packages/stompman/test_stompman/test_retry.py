@@ -0,0 +1,29 @@
+import pytest
+from stompman import ExponentialBackoff
+
+
+def test_exponential_backoff_without_jitter() -> None:
+    policy = ExponentialBackoff(base_delay=1, max_delay=5, jitter=False)
+    delays: list[float] = []
+    previous_delay = None
+    for _ in range(5):
+        previous_delay = policy.get_delay(previous_delay)
+        delays.append(previous_delay)
+
+    assert delays == [1, 2, 4, 5, 5]
+
+
+@pytest.mark.parametrize("previous_delay", [None, 0.1, 1, 3, 100])
+def test_exponential_backoff_with_jitter_stays_in_bounds(previous_delay: float | None) -> None:
+    policy = ExponentialBackoff(base_delay=1, max_delay=5)
+    upper_bound = policy.base_delay if previous_delay is None else min(max(previous_delay * 3, 1), policy.max_delay)
+    lower_bound = policy.base_delay / 2 if previous_delay is None else min(previous_delay * 3, policy.base_delay)
+
+    for _ in range(100):
+        assert lower_bound <= policy.get_delay(previous_delay) <= upper_bound
+
+
+def test_exponential_backoff_with_jitter_spreads_delays() -> None:
+    policy = ExponentialBackoff()
+
+    assert len({policy.get_delay(None) for _ in range(10)}) > 1
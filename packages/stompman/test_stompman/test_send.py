@@ -3,9 +3,10 @@ from typing import Any
 
 import pytest
 from stompman import (
+    Outbox,
     SendFrame,
 )
-from stompman.frames import SendHeaders
+from stompman.frames import BytesLike, SendHeaders
 
 from test_stompman.conftest import (
     EnrichedClient,
@@ -40,9 +41,24 @@ pytestmark = pytest.mark.anyio
             b"Some body",
             {"destination": "Some/queue"},
         ),
+        (
+            {"body": bytearray(b"Some body"), "destination": "Some/queue"},
+            b"Some body",
+            {"content-length": "9", "destination": "Some/queue"},
+        ),
+        (
+            {"body": memoryview(b"Some body")[5:], "destination": "Some/queue"},
+            b"body",
+            {"content-length": "4", "destination": "Some/queue"},
+        ),
+        (
+            {"body": memoryview(b"Some body").cast("B", (3, 3)), "destination": "Some/queue"},
+            memoryview(b"Some body").cast("B", (3, 3)),
+            {"content-length": "9", "destination": "Some/queue"},
+        ),
     ],
 )
-async def test_send_message(args: dict[str, Any], expected_body: bytes, expected_headers: SendHeaders) -> None:
+async def test_send_message(args: dict[str, Any], expected_body: BytesLike, expected_headers: SendHeaders) -> None:
     connection_class, collected_frames = create_spying_connection(*get_read_frames_with_lifespan([]))
 
     async with EnrichedClient(connection_class=connection_class) as client:
@@ -52,3 +68,59 @@ async def test_send_message(args: dict[str, Any], expected_body: bytes, expected
     assert collected_frames == enrich_expected_frames(
         SendFrame(headers=expected_headers, body=expected_body),
     )
+
+
+@pytest.mark.parametrize(
+    ("args", "body", "expected_headers"),
+    [
+        (
+            {"destination": "Some/queue"},
+            b"Some body",
+            {"content-length": "9", "destination": "Some/queue"},
+        ),
+        (
+            {"destination": "Some/queue", "content_type": "text/plain", "headers": {"content-length": "100"}},
+            b"Some body",
+            {"content-length": "9", "destination": "Some/queue", "content-type": "text/plain"},
+        ),
+        (
+            {"destination": "Some/queue", "add_content_length": False, "headers": {"correlation-id": "a:b"}},
+            b"Some body",
+            {"destination": "Some/queue", "correlation-id": "a:b"},
+        ),
+        (
+            {"destination": "Some/queue"},
+            memoryview(b"Some body").cast("B", (3, 3)),
+            {"content-length": "9", "destination": "Some/queue"},
+        ),
+        (
+            {"destination": "Some/queue"},
+            b"",
+            {"content-length": "0", "destination": "Some/queue"},
+        ),
+    ],
+)
+async def test_prepared_sender(args: dict[str, Any], body: BytesLike, expected_headers: SendHeaders) -> None:
+    connection_class, collected_frames = create_spying_connection(*get_read_frames_with_lifespan([]))
+
+    async with EnrichedClient(connection_class=connection_class) as client:
+        sender = client.prepare_sender(**args)
+        await sender.send(body)
+        await sender.send(body)
+        await asyncio.sleep(0)
+
+    expected_frame = SendFrame(headers=expected_headers, body=body)
+    assert collected_frames == enrich_expected_frames(expected_frame, expected_frame)
+
+
+async def test_send_message_with_outbox_returns_written_handle() -> None:
+    connection_class, collected_frames = create_spying_connection(*get_read_frames_with_lifespan([]))
+
+    async with EnrichedClient(connection_class=connection_class, outbox=Outbox(max_frames=10)) as client:
+        written = await client.send(b"body", destination="Some/queue")
+        await written
+        await asyncio.sleep(0)
+
+    assert collected_frames == enrich_expected_frames(
+        SendFrame(headers={"content-length": "4", "destination": "Some/queue"}, body=b"body"),
+    )
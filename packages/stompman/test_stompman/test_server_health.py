@@ -0,0 +1,156 @@
+import math
+from dataclasses import dataclass
+
+import pytest
+from stompman import ConnectionParameters, ServerHealth, ServerHealthTracker
+from stompman.server_health import LATENCY_SMOOTHING_FACTOR
+
+
+@dataclass
+class FakeClock:
+    now: float = 100
+
+    def __call__(self) -> float:
+        return self.now
+
+
+FIRST_SERVER, SECOND_SERVER, THIRD_SERVER = (
+    ConnectionParameters("localhost", port, "login", "passcode") for port in (1, 2, 3)
+)
+ALL_SERVERS = [FIRST_SERVER, SECOND_SERVER, THIRD_SERVER]
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def tracker(clock: FakeClock) -> ServerHealthTracker:
+    return ServerHealthTracker(clock=clock)
+
+
+def make_failing(tracker: ServerHealthTracker, server: ConnectionParameters, failures: int) -> None:
+    for _ in range(failures):
+        tracker.record_failure(server)
+
+
+def test_unknown_servers_keep_order(tracker: ServerHealthTracker) -> None:
+    assert tracker.order(ALL_SERVERS) == ALL_SERVERS
+    assert tracker.get(FIRST_SERVER).latency == math.inf
+
+
+def test_health_is_keyed_by_host_and_port(tracker: ServerHealthTracker) -> None:
+    tracker.record_error_frame(FIRST_SERVER)
+
+    assert tracker.get(ConnectionParameters("localhost", 1, "other login", "other passcode")).error_frames == 1
+    assert list(tracker.snapshot()) == [("localhost", 1)]
+
+
+def test_latency_is_smoothed(tracker: ServerHealthTracker) -> None:
+    first_latency, second_latency = 0.1, 0.5
+    tracker.record_connect(FIRST_SERVER, first_latency)
+    tracker.record_connect(FIRST_SERVER, second_latency)
+    tracker.record_confirmation(FIRST_SERVER, first_latency)
+
+    expected_connect_latency = first_latency + LATENCY_SMOOTHING_FACTOR * (second_latency - first_latency)
+    health = tracker.get(FIRST_SERVER)
+    assert health.connect_latency == pytest.approx(expected_connect_latency)
+    assert health.latency == pytest.approx(expected_connect_latency + first_latency)
+
+
+def test_fastest_healthy_servers_go_first(tracker: ServerHealthTracker) -> None:
+    for server, latency in ((FIRST_SERVER, 0.3), (SECOND_SERVER, 0.1)):
+        tracker.record_connect(server, latency)
+        tracker.record_confirmation(server, latency)
+    tracker.record_failure(FIRST_SERVER)
+
+    assert tracker.order(ALL_SERVERS) == [SECOND_SERVER, THIRD_SERVER, FIRST_SERVER]
+
+
+def test_error_frames_demote_server(tracker: ServerHealthTracker) -> None:
+    tracker.record_error_frame(FIRST_SERVER)
+
+    assert tracker.order(ALL_SERVERS) == [SECOND_SERVER, THIRD_SERVER, FIRST_SERVER]
+
+
+def test_cooldown_skips_server(tracker: ServerHealthTracker, clock: FakeClock) -> None:
+    make_failing(tracker, FIRST_SERVER, tracker.cooldown_after_failures - 1)
+    assert tracker.order(ALL_SERVERS) == [SECOND_SERVER, THIRD_SERVER, FIRST_SERVER]
+
+    tracker.record_failure(FIRST_SERVER)
+    assert tracker.get(FIRST_SERVER).cooldown_until == clock.now + tracker.cooldown
+    assert tracker.order(ALL_SERVERS) == [SECOND_SERVER, THIRD_SERVER]
+
+    clock.now += tracker.cooldown
+    assert tracker.order(ALL_SERVERS) == [SECOND_SERVER, THIRD_SERVER, FIRST_SERVER]
+
+
+def test_cooldown_grows_up_to_max(tracker: ServerHealthTracker, clock: FakeClock) -> None:
+    make_failing(tracker, FIRST_SERVER, tracker.cooldown_after_failures + 1)
+    assert tracker.get(FIRST_SERVER).cooldown_until == clock.now + tracker.cooldown * 2
+
+    make_failing(tracker, FIRST_SERVER, 100)
+    assert tracker.get(FIRST_SERVER).cooldown_until == clock.now + tracker.max_cooldown
+
+
+def test_all_circuits_open_returns_first_to_be_half_open(tracker: ServerHealthTracker) -> None:
+    make_failing(tracker, FIRST_SERVER, tracker.cooldown_after_failures + 1)
+    make_failing(tracker, SECOND_SERVER, tracker.cooldown_after_failures)
+
+    assert tracker.order([FIRST_SERVER, SECOND_SERVER]) == [SECOND_SERVER]
+    assert tracker.order([]) == []
+
+
+def test_circuit_breaker(tracker: ServerHealthTracker, clock: FakeClock) -> None:
+    make_failing(tracker, FIRST_SERVER, tracker.cooldown_after_failures - 1)
+    assert tracker.get_circuit_state(FIRST_SERVER) == "closed"
+
+    tracker.record_failure(FIRST_SERVER)
+    assert tracker.get_circuit_state(FIRST_SERVER) == "open"
+
+    clock.now += tracker.cooldown
+    assert tracker.get_circuit_state(FIRST_SERVER) == "half-open"
+    assert tracker.order(ALL_SERVERS) == [SECOND_SERVER, THIRD_SERVER, FIRST_SERVER]
+
+    tracker.record_failure(FIRST_SERVER)
+    assert tracker.get_circuit_state(FIRST_SERVER) == "open"
+
+    clock.now += tracker.cooldown * 2
+    tracker.record_confirmation(FIRST_SERVER, 0.1)
+    assert tracker.get_circuit_state(FIRST_SERVER) == "closed"
+
+    tracker.record_connection_lost(FIRST_SERVER)
+    assert tracker.get_circuit_state(FIRST_SERVER) == "open"
+    assert tracker.get(FIRST_SERVER).cooldown_until == clock.now + tracker.cooldown * 4
+
+
+def test_stable_connection_lost_resets_failures(tracker: ServerHealthTracker, clock: FakeClock) -> None:
+    make_failing(tracker, FIRST_SERVER, tracker.cooldown_after_failures)
+    tracker.record_error_frame(FIRST_SERVER)
+    tracker.record_confirmation(FIRST_SERVER, 0.1)
+    clock.now += tracker.stable_connection_time
+
+    tracker.record_connection_lost(FIRST_SERVER)
+
+    health = tracker.get(FIRST_SERVER)
+    assert (health.consecutive_failures, health.error_frames, health.cooldown_until) == (0, 0, 0)
+    assert health.connected_at is None
+
+
+def test_short_lived_connection_lost_counts_as_failure(tracker: ServerHealthTracker) -> None:
+    for _ in range(tracker.cooldown_after_failures):
+        tracker.record_confirmation(FIRST_SERVER, 0.1)
+        tracker.record_connection_lost(FIRST_SERVER)
+
+    assert tracker.get(FIRST_SERVER).consecutive_failures == tracker.cooldown_after_failures
+    assert tracker.order(ALL_SERVERS) == [SECOND_SERVER, THIRD_SERVER]
+
+
+def test_snapshot_is_a_copy(tracker: ServerHealthTracker) -> None:
+    tracker.record_failure(FIRST_SERVER)
+
+    snapshot = tracker.snapshot()
+    tracker.record_failure(FIRST_SERVER)
+
+    assert snapshot == {("localhost", 1): ServerHealth(consecutive_failures=1)}
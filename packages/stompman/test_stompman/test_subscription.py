@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from collections.abc import AsyncGenerator
+from datetime import timedelta
 from functools import partial
 from typing import Final, Self, get_args
 from unittest import mock
@@ -17,6 +18,7 @@ from stompman import (
     HeartbeatFrame,
     MessageFrame,
     NackFrame,
+    RawMessageFrame,
     ReceiptFrame,
     SendFrame,
     SubscribeFrame,
@@ -717,3 +719,73 @@ async def test_max_concurrent_handlers_bounds_in_flight_handlers(
         await subscription.unsubscribe()
 
     assert peak == max_concurrent
+
+
+async def test_client_raw_subscriptions(monkeypatch: pytest.MonkeyPatch, faker: faker.Faker) -> None:
+    monkeypatch.setattr(
+        stompman.subscription,
+        "_make_subscription_id",
+        mock.Mock(side_effect=[(auto_ack_sub_id := faker.pystr()), (manual_ack_sub_id := faker.pystr())]),
+    )
+    first_message_frame = build_dataclass(MessageFrame, headers={"subscription": auto_ack_sub_id, "ack": "1"})
+    second_message_frame = build_dataclass(MessageFrame, headers={"subscription": manual_ack_sub_id, "ack": "2"})
+    connection_class, collected_frames = create_spying_connection(
+        *get_read_frames_with_lifespan([first_message_frame, second_message_frame])
+    )
+    auto_ack_handler = mock.AsyncMock(return_value=None)
+
+    async def manual_ack_handler(frame: stompman.AckableRawMessageFrame) -> None:
+        assert frame.body == second_message_frame.body
+        assert frame.to_message_frame() == second_message_frame
+        await frame.ack()
+
+    async with EnrichedClient(connection_class=connection_class) as client:
+        auto_ack_subscription = await client.subscribe(
+            faker.pystr(), auto_ack_handler, on_suppressed_exception=mock.Mock(), raw=True
+        )
+        manual_ack_subscription = await client.subscribe_with_manual_ack(faker.pystr(), manual_ack_handler, raw=True)
+        assert client._active_subscriptions.raw_subscription_ids == {auto_ack_sub_id, manual_ack_sub_id}
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await auto_ack_subscription.unsubscribe()
+        await manual_ack_subscription.unsubscribe()
+        assert not client._active_subscriptions.raw_subscription_ids
+
+    auto_ack_handler.assert_called_once_with(RawMessageFrame.from_message_frame(first_message_frame))
+    assert [frame for frame in collected_frames if isinstance(frame, AckFrame)] == [
+        AckFrame(headers={"id": "1", "subscription": auto_ack_sub_id}),
+        AckFrame(headers={"id": "2", "subscription": manual_ack_sub_id}),
+    ]
+
+
+def test_client_passes_frame_parser_settings(faker: faker.Faker) -> None:
+    spool_threshold, max_frame_size, max_header_bytes, max_headers = (faker.pyint() for _ in range(4))
+    client = EnrichedClient(
+        connection_class=BaseMockConnection,
+        raw_message_spool_threshold=spool_threshold,
+        max_frame_size=max_frame_size,
+        max_header_bytes=max_header_bytes,
+        max_headers=max_headers,
+    )
+
+    parser = client._connection_manager.frame_parser_factory()
+
+    assert parser._raw_message_spool_threshold == spool_threshold
+    assert (parser._max_frame_size, parser._max_header_bytes, parser._max_headers) == (
+        max_frame_size,
+        max_header_bytes,
+        max_headers,
+    )
+    assert parser._raw_message_subscription_ids is client._active_subscriptions.raw_subscription_ids
+
+
+async def test_client_passes_write_settings() -> None:
+    window, max_queued_send_frames = timedelta(microseconds=50), 10
+    connection_class, _ = create_spying_connection(*get_read_frames_with_lifespan([]))
+
+    async with EnrichedClient(
+        connection_class=connection_class, write_coalescing_window=window, max_queued_send_frames=max_queued_send_frames
+    ) as client:
+        connection = (await client._connection_manager._get_active_connection_state()).connection
+        assert connection.write_coalescing_window == window
+        assert connection.max_queued_send_frames == max_queued_send_frames
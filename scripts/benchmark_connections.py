@@ -0,0 +1,222 @@
+"""Throughput benchmark for connection classes against a local stand-in broker.
+
+Stand-in broker streams MESSAGE frames to client (receive), drains SEND frames from client (send) and answers each SEND
+frame with RECEIPT before client sends next one (roundtrip). Compares TCP loopback with `Connection` and
+`BufferedProtocolConnection` with Unix domain socket with `UnixSocketConnection`.
+
+    uv run scripts/benchmark_connections.py
+    uv run scripts/benchmark_connections.py --body-size 65536 --frame-count 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from stompman import ConnectionLostError, MessageFrame, ReceiptFrame, SendFrame
+from stompman.connection import Connection
+from stompman.connection_protocol import BufferedProtocolConnection
+from stompman.connection_unix import UnixSocketConnection
+from stompman.serde import dump_frame, dump_frame_parts
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+READ_MAX_CHUNK_SIZE = 1024 * 1024
+REPEAT = 5
+ROUNDTRIP_COUNT = 5000
+
+
+@dataclass(frozen=True, slots=True)
+class Transport:
+    name: str
+    connection_class: type[Connection]
+    is_unix: bool
+
+
+TRANSPORTS = [
+    Transport(name="tcp/Connection", connection_class=Connection, is_unix=False),
+    Transport(name="tcp/BufferedProtocolConnection", connection_class=BufferedProtocolConnection, is_unix=False),
+    Transport(name="unix/UnixSocketConnection", connection_class=UnixSocketConnection, is_unix=True),
+]
+
+
+@dataclass(frozen=True, slots=True)
+class Workload:
+    frame_count: int
+    message_bytes: bytes
+    send_frame: SendFrame
+
+
+def make_workload(*, body_size: int, frame_count: int) -> Workload:
+    body = b"x" * body_size
+    destination, content_length = "/queue/benchmark", str(body_size)
+    message = MessageFrame(
+        headers={
+            "destination": destination,
+            "content-length": content_length,
+            "message-id": "1",
+            "subscription": "1",
+        },
+        body=body,
+    )
+    return Workload(
+        frame_count=frame_count,
+        message_bytes=dump_frame(message) * frame_count,
+        send_frame=SendFrame(headers={"destination": destination, "content-length": content_length}, body=body),
+    )
+
+
+async def _start_broker(
+    transport: Transport,
+    handle: Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]],
+    directory: Path,
+) -> tuple[asyncio.Server, str, int]:
+    if transport.is_unix:
+        path = str(directory / "broker.sock")
+        return await asyncio.start_unix_server(handle, path=path), path, 0
+    server = await asyncio.start_server(handle, host="127.0.0.1", port=0)
+    host, port = server.sockets[0].getsockname()[:2]
+    return server, host, port
+
+
+async def _connect(transport: Transport, host: str, port: int) -> Connection:
+    connection = await transport.connection_class.connect(
+        host=host, port=port, timeout=2, read_max_chunk_size=READ_MAX_CHUNK_SIZE, ssl=None
+    )
+    if connection is None:
+        msg = f"failed to connect to stand-in broker with {transport.name}"
+        raise RuntimeError(msg)
+    return connection
+
+
+async def measure_receive(transport: Transport, workload: Workload, directory: Path) -> float:
+    async def handle(_: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(workload.message_bytes)
+        await writer.drain()
+        writer.close()
+
+    server, host, port = await _start_broker(transport, handle, directory)
+    async with server:
+        connection = await _connect(transport, host, port)
+        received_count = 0
+        started_at = time.perf_counter()
+        try:
+            async for _ in connection.read_frames():
+                received_count += 1
+        except ConnectionLostError:
+            pass
+        elapsed = time.perf_counter() - started_at
+        await connection.close()
+    if received_count != workload.frame_count:
+        msg = f"received {received_count} frames instead of {workload.frame_count}"
+        raise RuntimeError(msg)
+    return elapsed
+
+
+async def measure_send(transport: Transport, workload: Workload, directory: Path) -> float:
+    parts = dump_frame_parts(workload.send_frame)
+    expected_byte_count = sum(len(part) for part in parts) * workload.frame_count
+    all_received = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, _: asyncio.StreamWriter) -> None:
+        received_byte_count = 0
+        while received_byte_count < expected_byte_count and (chunk := await reader.read(READ_MAX_CHUNK_SIZE)):
+            received_byte_count += len(chunk)
+        all_received.set()
+
+    server, host, port = await _start_broker(transport, handle, directory)
+    async with server:
+        connection = await _connect(transport, host, port)
+        started_at = time.perf_counter()
+        for _ in range(workload.frame_count):
+            await connection.write_frame_parts(parts)
+        await all_received.wait()
+        elapsed = time.perf_counter() - started_at
+        await connection.close()
+    return elapsed
+
+
+async def measure_roundtrip(transport: Transport, workload: Workload, directory: Path) -> float:
+    parts = dump_frame_parts(workload.send_frame)
+    frame_size = sum(len(part) for part in parts)
+    receipt = dump_frame(ReceiptFrame(headers={"receipt-id": "1"}))
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with suppress(asyncio.IncompleteReadError):
+            while await reader.readexactly(frame_size):
+                writer.write(receipt)
+                await writer.drain()
+
+    server, host, port = await _start_broker(transport, handle, directory)
+    async with server:
+        connection = await _connect(transport, host, port)
+        frames = connection.read_frames()
+        started_at = time.perf_counter()
+        for _ in range(ROUNDTRIP_COUNT):
+            await connection.write_frame_parts(parts)
+            await anext(frames)
+        elapsed = time.perf_counter() - started_at
+        await frames.aclose()
+        await connection.close()
+    return elapsed
+
+
+async def run_benchmarks(workload: Workload) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for transport in TRANSPORTS:
+            for direction, measure in (("receive", measure_receive), ("send", measure_send)):
+                seconds = statistics.median(
+                    [await measure(transport, workload, Path(directory)) for _ in range(REPEAT)]
+                )
+                results[f"{direction}/{transport.name}"] = {
+                    "frames_per_second": workload.frame_count / seconds,
+                    "mb_per_second": len(workload.message_bytes) / seconds / 1e6,
+                }
+            seconds = statistics.median(
+                [await measure_roundtrip(transport, workload, Path(directory)) for _ in range(REPEAT)]
+            )
+            results[f"roundtrip/{transport.name}"] = {
+                "frames_per_second": ROUNDTRIP_COUNT / seconds,
+                "us_per_roundtrip": seconds / ROUNDTRIP_COUNT * 1e6,
+            }
+    return results
+
+
+def _format_optional(value: float | None, width: int) -> str:
+    return f"{value:>{width}.1f}" if value is not None else f"{'-':>{width}}"
+
+
+def format_report(results: dict[str, dict[str, float]]) -> str:
+    lines = [f"{'benchmark':<40} {'frames/s':>12} {'MB/s':>10} {'us/roundtrip':>14}"]
+    lines.extend(
+        f"{name:<40} {result['frames_per_second']:>12,.0f} {_format_optional(result.get('mb_per_second'), 10)} "
+        f"{_format_optional(result.get('us_per_roundtrip'), 14)}"
+        for name, result in results.items()
+    )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argument_parser.add_argument("--body-size", type=int, default=200)
+    argument_parser.add_argument("--frame-count", type=int, default=100_000)
+    arguments = argument_parser.parse_args()
+
+    workload = make_workload(body_size=arguments.body_size, frame_count=arguments.frame_count)
+    results = asyncio.run(run_benchmarks(workload))
+    sys.stdout.write(format_report(results) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Microbenchmarks for `stompman.serde`.
+
+Measures `FrameParser.parse_frames_from_chunk()` and `dump_frame()` on typical frame shapes and reports time per frame,
+throughput and memory blocks that stay allocated per frame (frame objects, headers, bodies).
+
+    uv run scripts/benchmark_serde.py                      # compare with recorded baseline
+    uv run scripts/benchmark_serde.py --save               # record new baseline
+    uv run scripts/benchmark_serde.py --baseline other.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import timeit
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from stompman import AnyClientFrame, AnyServerFrame, FrameParser, MessageFrame, dump_frame
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from stompman.frames import MessageHeaders
+
+DEFAULT_BASELINE_PATH = Path(__file__).with_name("serde_benchmark_baseline.json")
+READ_CHUNK_SIZE = 64 * 1024
+REPEAT = 7
+NOISE_THRESHOLD_PERCENT = 5
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    name: str
+    raw: bytes
+    frame_count: int
+    frames: list[MessageFrame] | None  # frames to dump, None when the case is parse-only
+    chunk_size: int = READ_CHUNK_SIZE
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    ns_per_frame: float
+    mb_per_second: float
+    blocks_per_frame: float
+
+
+def _make_message_frame(index: int, body: bytes, extra_headers: dict[str, str] | None = None) -> MessageFrame:
+    headers: MessageHeaders = {
+        "destination": "/queue/orders",
+        "message-id": f"ID:broker-1-{index}",
+        "subscription": "subscription-1",
+        "ack": f"ack-{index}",
+        "content-length": str(len(body)),
+    }
+    headers.update(extra_headers or {})  # type: ignore[typeddict-item]
+    return MessageFrame(headers=headers, body=body)
+
+
+def _make_case(name: str, frames: list[MessageFrame], chunk_size: int = READ_CHUNK_SIZE) -> Case:
+    return Case(
+        name=name,
+        raw=b"".join(dump_frame(frame) for frame in frames),
+        frame_count=len(frames),
+        frames=frames,
+        chunk_size=chunk_size,
+    )
+
+
+def make_cases() -> list[Case]:
+    json_body = json.dumps({"id": 1, "status": "shipped", "items": [{"sku": "A-1", "count": 2}] * 4}).encode()
+    json_body = json_body.ljust(200)
+    json_frames = [_make_message_frame(index, json_body, {"content-type": "application/json"}) for index in range(1000)]
+    jms_headers = {
+        "JMSType": "OrderShipped",
+        "JMSCorrelationID": "correlation-1",
+        "JMSDeliveryMode": "PERSISTENT",
+        "JMSPriority": "4",
+        "JMSTimestamp": "1700000000000",
+        "JMSExpiration": "0",
+        "JMSRedelivered": "false",
+        "__AMQ_CID": "client-1",
+        "_AMQ_ROUTING_TYPE": "1",
+        "persistent": "true",
+        "priority": "4",
+        "timestamp": "1700000000000",
+        "expires": "0",
+        "redelivered": "false",
+        "content-type": "application/json",
+        **{f"x-application-header-{index}": f"value-{index}" for index in range(10)},
+    }
+    escaped_headers = {
+        "reply-to": "/queue/replies:1",
+        "x-trace": "line1\nline2",
+        "x-path": "C:\\orders\\archive",
+    }
+    return [
+        Case(name="heartbeats", raw=b"\n" * 10_000, frame_count=10_000, frames=None),
+        _make_case("json-200b", json_frames),
+        _make_case("binary-1mb", [_make_message_frame(0, bytes(range(256)) * 4096)]),
+        _make_case("jms-many-headers", [_make_message_frame(index, json_body, jms_headers) for index in range(1000)]),
+        _make_case("escaped-headers", [_make_message_frame(index, b"{}", escaped_headers) for index in range(1000)]),
+        _make_case("json-200b-split", json_frames, chunk_size=100),
+    ]
+
+
+def _split_chunks(raw: bytes, chunk_size: int) -> list[bytes]:
+    return [raw[position : position + chunk_size] for position in range(0, len(raw), chunk_size)]
+
+
+def _parse_all(chunks: list[bytes]) -> list[AnyClientFrame | AnyServerFrame]:
+    parser = FrameParser()
+    return [frame for chunk in chunks for frame in parser.parse_frames_from_chunk(chunk)]
+
+
+def _dump_all(frames: list[MessageFrame]) -> list[bytes]:
+    return [dump_frame(frame) for frame in frames]
+
+
+def _count_retained_blocks(function: Callable[[], object]) -> int:
+    gc.collect()
+    gc.disable()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        retained = function()
+        blocks_after = sys.getallocatedblocks()
+        del retained
+    finally:
+        gc.enable()
+    return blocks_after - blocks_before
+
+
+def _measure(function: Callable[[], object], *, frame_count: int, byte_count: int) -> Result:
+    function()  # warm up caches, e.g. dump_header()
+    seconds = min(timeit.repeat(function, number=1, repeat=REPEAT))
+    return Result(
+        ns_per_frame=seconds / frame_count * 1e9,
+        mb_per_second=byte_count / seconds / 1e6,
+        blocks_per_frame=_count_retained_blocks(function) / frame_count,
+    )
+
+
+def run_benchmarks() -> dict[str, Result]:
+    results = {}
+    for case in make_cases():
+        chunks = _split_chunks(case.raw, case.chunk_size)
+        results[f"parse/{case.name}"] = _measure(
+            partial(_parse_all, chunks), frame_count=case.frame_count, byte_count=len(case.raw)
+        )
+        if case.frames is not None:
+            results[f"dump/{case.name}"] = _measure(
+                partial(_dump_all, case.frames), frame_count=case.frame_count, byte_count=len(case.raw)
+            )
+    return results
+
+
+def _format_change(current: float, baseline: float | None, *, lower_is_better: bool) -> str:
+    if not baseline:
+        return ""
+    change = (current - baseline) / baseline * 100
+    if abs(change) < NOISE_THRESHOLD_PERCENT:
+        return f"{change:+.1f}%"
+    is_better = (change < 0) == lower_is_better
+    return f"{change:+.1f}% ({'better' if is_better else 'worse'})"
+
+
+def format_report(results: dict[str, Result], baseline: dict[str, dict[str, Any]]) -> str:
+    lines = [
+        f"{'benchmark':<26} {'ns/frame':>10} {'':>16} {'MB/s':>10} {'':>16} {'blocks/frame':>12} {'':>16}",
+    ]
+    for name, result in results.items():
+        baseline_result = baseline.get(name, {})
+        ns_change = _format_change(result.ns_per_frame, baseline_result.get("ns_per_frame"), lower_is_better=True)
+        mb_change = _format_change(result.mb_per_second, baseline_result.get("mb_per_second"), lower_is_better=False)
+        blocks_change = _format_change(
+            result.blocks_per_frame, baseline_result.get("blocks_per_frame"), lower_is_better=True
+        )
+        lines.append(
+            f"{name:<26} {result.ns_per_frame:>10.0f} {ns_change:>16} {result.mb_per_second:>10.1f} {mb_change:>16} "
+            f"{result.blocks_per_frame:>12.1f} {blocks_change:>16}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    argument_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    argument_parser.add_argument("--save", action="store_true", help="write results to baseline file")
+    arguments = argument_parser.parse_args()
+
+    results = run_benchmarks()
+    baseline = json.loads(arguments.baseline.read_text()) if arguments.baseline.exists() else {}
+    sys.stdout.write(format_report(results, baseline) + "\n")
+    if arguments.save:
+        arguments.baseline.write_text(
+            json.dumps(
+                {
+                    name: {key: round(value, 2) for key, value in asdict(result).items()}
+                    for name, result in results.items()
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        sys.stdout.write(f"Saved baseline to {arguments.baseline}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())